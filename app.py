@@ -4,25 +4,51 @@ Single entry point for the complete recipe recommendation system:
 - Initializes agent from agent.py factory (async)
 - Initializes tracing with dedicated database
 - Creates AgentOS instance for REST API with tracing enabled
+- Warms up the Gemini connection on startup, releases pooled connections on shutdown (lifespan)
 - Serves recipe recommendation endpoints
 
 Run with: python app.py
 """
 
 import asyncio
+from contextlib import asynccontextmanager
 
 from agno.os import AgentOS
 
 from src.utils.config import config
 from src.utils.logger import logger
 from src.agents.agent import initialize_recipe_agent
+from src.utils.async_compat import run_sync
+from src.mcp_tools.ingredients import close_http_session
+from src.utils.gemini import warm_up_genai_client
 
 
 # Initialize agent and tracing using async factory pattern
 logger.info("Starting Recipe Recommendation Service initialization...")
 
-# Run async initialization at startup
-agent, tracing_db, knowledge = asyncio.run(initialize_recipe_agent())
+# Run async initialization at startup (also safe when imported from a running loop, e.g. `uvicorn app:app`)
+agent, tracing_db, knowledge = run_sync(initialize_recipe_agent())
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Warm up the Gemini connection on startup; close pooled connections on shutdown.
+
+    The agent itself is built before AgentOS (routes are generated from it), and it holds no
+    loop-bound clients: the image download session and Gemini's HTTP sessions are created lazily
+    on the serving loop.
+    """
+    # Fire-and-forget so startup isn't delayed; the first request reuses the warm connection
+    warmup_task = asyncio.create_task(warm_up_genai_client())
+    yield
+    warmup_task.cancel()
+    await close_http_session()
+    for db in (agent.db, tracing_db):
+        engine = getattr(db, "db_engine", None)
+        if engine is not None:
+            logger.info(f"Disposing database engine: {getattr(db, 'id', 'unknown')}")
+            engine.dispose()
+
 
 # Create AgentOS with the agent, knowledge base, and tracing enabled (if configured)
 logger.info("Creating AgentOS instance...")
@@ -34,6 +60,7 @@ agent_os = AgentOS(
     knowledge=[knowledge] if knowledge else [],
     tracing=config.ENABLE_TRACING,
     tracing_db=tracing_db,
+    lifespan=lifespan,
 )
 
 # Get the FastAPI app for external serving
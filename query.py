@@ -9,6 +9,8 @@ Usage:
     python query.py --debug "Your query"  # Show full JSON response
     python query.py --stateless "Your query"  # No session history (clear memory)
     python query.py --image images/pasta.png "What can I make?"  # With image detection
+    python query.py --batch queries.txt  # One query per line, single agent initialization
+    python query.py -- recipes -without nuts  # "--" ends the flags, for query words starting with "-"
 
 Features:
 - Direct agent execution via arun()
@@ -16,27 +18,62 @@ Features:
 - Debug mode to display full JSON with all fields
 - Stateless mode to run without session history or memory
 - Image support for ingredient detection
+- Batch mode to run many queries with one agent initialization
 - Clean exit after completion
 """
 
+import argparse
 import asyncio
+import atexit
 import base64
-import json
 import sys
+import threading
+from functools import lru_cache
 from pathlib import Path
-
-from rich.console import Console
-from rich.markdown import Markdown
+from typing import Optional
 
 from src.utils.logger import logger
-from src.agents.agent import initialize_recipe_agent
 
-console = Console()
+# rich, pydantic-core and the agent stack (Agno, Gemini, MCP) are imported where they are
+# used, so the usage/flag-error paths in __main__ exit without paying for those imports
+
+# Image MIME types by file extension for --image uploads
+_MIME_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+
+# Input bytes base64-encoded per step when building image data URLs (a multiple of 3, so
+# no padding appears mid-stream)
+_B64_CHUNK_SIZE = 3 * 64 * 1024
+
+# Background event loop shared by all run_query calls (see _get_event_loop)
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Seconds to wait for loop-bound clients to close at interpreter exit
+_SHUTDOWN_TIMEOUT = 5
+
+# Whether the Gemini connection has been warmed in this process (see _get_agent)
+_genai_warmed = False
+
+# Sentinel for attribute lookups where None is a meaningful value
+_MISSING = object()
 
 # Note: Image compression now handled by pre-hook in src/mcp_tools/ingredients.py
 # This keeps compression centralized and works for both query and run modes
 
 
+@lru_cache(maxsize=1)
+def _get_console():
+    """Return the shared rich Console, importing rich on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
 def extract_response_text(response) -> str:
     """Extract markdown response text from agent response object.
 
@@ -53,22 +90,232 @@ def extract_response_text(response) -> str:
         Extracted response text or empty string if not found
     """
     # Try RecipeResponse object with response field
-    if hasattr(response, "response") and response.response:
-        return response.response
+    # (single getattr with default per attribute instead of hasattr + attribute access)
+    text = getattr(response, "response", None)
+    if text:
+        return text
 
     # Try response.content with nested response field
-    if hasattr(response, "content") and response.content:
-        if hasattr(response.content, "response"):
-            return response.content.response
-        elif isinstance(response.content, dict) and "response" in response.content:
-            return response.content["response"]
-        elif isinstance(response.content, str):
-            return response.content
+    content = getattr(response, "content", None)
+    if content:
+        nested = getattr(content, "response", _MISSING)
+        if nested is not _MISSING:
+            return nested
+        elif isinstance(content, dict) and "response" in content:
+            return content["response"]
+        elif isinstance(content, str):
+            return content
 
     # Fallback to string representation
     return str(response) if response else ""
 
 
+def _image_data_url(image_bytes: bytes, mime_type: str) -> str:
+    """Build a base64 data URL with two payload-sized allocations instead of three.
+
+    Encoding in chunks straight into a preallocated bytearray skips the full-size b64encode()
+    result that the one-shot version then copies again (into a concatenation or f-string)
+    before the final str. Peak memory is unchanged (the buffer and the str coexist while
+    decoding), but one full-size allocation and memcpy pass is saved.
+
+    Args:
+        image_bytes: Raw image file contents.
+        mime_type: MIME type for the data URL header.
+
+    Returns:
+        The data URL ("data:<mime>;base64,<payload>").
+    """
+    prefix = f"data:{mime_type};base64,".encode("ascii")
+    buffer = bytearray(len(prefix) + 4 * ((len(image_bytes) + 2) // 3))
+    buffer[: len(prefix)] = prefix
+    position = len(prefix)
+    view = memoryview(image_bytes)
+    for start in range(0, len(image_bytes), _B64_CHUNK_SIZE):
+        encoded = base64.b64encode(view[start : start + _B64_CHUNK_SIZE])
+        buffer[position : position + len(encoded)] = encoded
+        position += len(encoded)
+    return buffer.decode("ascii")
+
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the persistent event loop, starting it on a daemon thread on first use.
+
+    All run_query calls share this loop, so the cached agent and the loop-bound clients it
+    holds (MCP session, Gemini HTTP sessions) stay usable across calls instead of being tied
+    to a loop that asyncio.run has already closed. Those clients are closed at interpreter
+    exit (see _shutdown_event_loop).
+
+    Returns:
+        Running asyncio event loop
+    """
+    global _event_loop
+    if _event_loop is None:
+        _event_loop = asyncio.new_event_loop()
+        threading.Thread(target=_event_loop.run_forever, name="query-event-loop", daemon=True).start()
+        atexit.register(_shutdown_event_loop)
+    return _event_loop
+
+
+async def _close_clients() -> None:
+    """Close the image download session, Gemini HTTP sessions and agent MCP sessions."""
+    from src.mcp_tools.ingredients import close_http_session
+    from src.utils.gemini import close_genai_client
+
+    await close_http_session()
+    await close_genai_client()
+    # Only present once an agent has been built; importing it here would pull in the agent stack
+    agent_module = sys.modules.get("src.agents.agent")
+    if agent_module is not None:
+        await agent_module.close_agent_tools()
+
+
+def _shutdown_event_loop() -> None:
+    """Close loop-bound clients on the persistent loop, then stop it (registered with atexit)."""
+    loop = _event_loop
+    if loop is None or not loop.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_close_clients(), loop).result(timeout=_SHUTDOWN_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Closing clients at exit failed: {e}")
+    loop.call_soon_threadsafe(loop.stop)
+
+
+async def _fail_fast(coro):
+    """Await coro, turning SystemExit from fail-fast initialization into an ordinary error.
+
+    SystemExit cannot cross the loop thread cleanly; as a RuntimeError it resolves the
+    caller's future, which then exits with status 1.
+    """
+    try:
+        return await coro
+    except SystemExit as e:
+        raise RuntimeError(f"Agent startup aborted (exit code {e.code})") from e
+
+
+async def _get_agent(use_db: bool):
+    """Return the initialized agent for the given persistence mode.
+
+    initialize_recipe_agent memoizes per use_db, so repeated run_query calls in one process
+    (REPL/batch drivers) pay the MCP handshake and DB setup once per mode.
+
+    Args:
+        use_db: Whether the agent should persist sessions and memory.
+
+    Returns:
+        Initialized Agno Agent
+    """
+    global _genai_warmed
+    from src.agents.agent import initialize_recipe_agent
+    from src.utils.gemini import warm_up_genai_client
+
+    if _genai_warmed:
+        # initialize_recipe_agent is async and returns (agent, tracing_db, knowledge) tuple
+        agent, _, _ = await initialize_recipe_agent(use_db=use_db)
+        return agent
+
+    # First call: open the Gemini connection while MCP/DB startup runs, so the query that
+    # follows reuses it instead of paying the TLS handshake on top of agent startup
+    # (gather runs each awaitable in its own task, so initialization gets its own _fail_fast)
+    (agent, _, _), _ = await asyncio.gather(_fail_fast(initialize_recipe_agent(use_db=use_db)), warm_up_genai_client())
+    _genai_warmed = True
+    return agent
+
+
+async def _run_query_async(query: str, debug: bool, stateless: bool, image_path: str = None) -> None:
+    """Initialize the agent and run the query on a single event loop.
+
+    Keeping init and arun on one loop lets connection pools opened during initialization
+    (Gemini HTTP sessions, image download session) be reused by the query itself.
+    """
+    from pydantic_core import from_json, to_json
+    from rich.markdown import Markdown
+    from rich.syntax import Syntax
+
+    from src.mcp_tools.ingredients import close_http_session
+
+    console = _get_console()
+    logger.info(f"Initializing agent (stateless={stateless})...")
+
+    # Initialize agent with persistence disabled for stateless queries (cached per mode)
+    agent = await _get_agent(use_db=not stateless)
+
+    logger.info(f"Running query: {query}")
+    if image_path:
+        logger.info(f"Image: {image_path}")
+    logger.info("---")
+
+    # Try to parse as JSON, otherwise treat as a text message
+    # (pydantic-core's Rust parser/serializer, fast on multi-MB base64 image payloads)
+    is_json_request = False
+    try:
+        request_data = from_json(query)
+        # If it's valid JSON, ensure it has a 'message' field
+        is_json_request = isinstance(request_data, dict) and "message" in request_data
+        if not is_json_request:
+            request_data = {"message": query}
+    except ValueError:
+        # If not JSON, treat the entire input as a message
+        request_data = {"message": query}
+
+    # Add image if provided
+    if image_path:
+        image_file = Path(image_path)
+
+        # Read image (compression handled by pre-hook)
+        logger.info(f"Loading image: {image_file.name}...")
+        with open(image_file, "rb") as f:
+            image_bytes = f.read()
+
+        # Determine MIME type based on extension
+        mime_type = _MIME_TYPES.get(image_file.suffix.lower(), "image/jpeg")
+
+        data_url = _image_data_url(image_bytes, mime_type)
+        del image_bytes
+
+        # Add image to request
+        if "images" not in request_data:
+            request_data["images"] = []
+        request_data["images"].append(data_url)
+        logger.info(f"✓ Loaded image: {image_file.name} ({len(data_url) / 1024:.1f} KB base64)")
+
+    # A well-formed JSON request is forwarded as-is; only re-serialize when it was built or mutated here
+    agent_input = query if is_json_request and not image_path else to_json(request_data).decode()
+
+    # Run the query and get response (same event loop as initialization)
+    try:
+        response = await agent.arun(input=agent_input)
+    finally:
+        await close_http_session()
+
+    logger.info("---")
+    console.print()  # Blank line for separation
+
+    # Display debug info if requested
+    if debug:
+        console.print("[bold cyan]Debug Mode: Full Response[/bold cyan]")
+        console.print("[dim]" + "=" * 60 + "[/dim]")
+        # Serialize straight to JSON (no intermediate model_dump dict for pydantic models; str
+        # fallback for non-JSON types such as metrics objects) and highlight it without re-parsing
+        if hasattr(response, "model_dump_json"):
+            response_json = response.model_dump_json(indent=2)
+        else:
+            response_json = to_json(response.__dict__, indent=2, fallback=str).decode()
+        console.print(Syntax(response_json, "json"))
+        console.print("[dim]" + "=" * 60 + "[/dim]")
+        console.print()
+
+    # Display response with proper markdown formatting and colors
+    response_text = extract_response_text(response)
+
+    if response_text:
+        # Render as markdown with rich formatting (colors, bold, etc.)
+        console.print(Markdown(response_text))
+    else:
+        # Fallback: print the response as-is
+        console.print("[yellow]No response text found[/yellow]")
+
+
 def run_query(query: str, debug: bool = False, stateless: bool = False, image_path: str = None) -> None:
     """Execute a single ad hoc query and print the response.
 
@@ -78,135 +325,149 @@ def run_query(query: str, debug: bool = False, stateless: bool = False, image_pa
         stateless: If True, disable persistence (no session memory).
         image_path: Optional path to an image file to include in the query.
     """
+    # Checked here rather than in the coroutine: SystemExit raised on the loop thread would stop the loop
+    if image_path and not Path(image_path).exists():
+        _get_console().print(f"[red]✗ Error: Image file not found: {image_path}[/red]")
+        sys.exit(1)
+
+    future = asyncio.run_coroutine_threadsafe(
+        _fail_fast(_run_query_async(query, debug=debug, stateless=stateless, image_path=image_path)),
+        _get_event_loop(),
+    )
     try:
-        logger.info(f"Initializing agent (stateless={stateless})...")
+        future.result()
+    except KeyboardInterrupt:
+        future.cancel()
+        logger.info("\nQuery interrupted by user.")
+        sys.exit(0)
+    except Exception as e:
+        logger.error(f"Query execution failed: {e}", exc_info=True)
+        sys.exit(1)
 
-        # Initialize agent with persistence disabled for stateless queries
-        # initialize_recipe_agent is async and returns (agent, tracing_db, knowledge) tuple
-        agent, _, _ = asyncio.run(initialize_recipe_agent(use_db=not stateless))
 
-        logger.info(f"Running query: {query}")
-        if image_path:
-            logger.info(f"Image: {image_path}")
-        logger.info("---")
+async def _run_batch_async(queries: list[str], debug: bool, stateless: bool) -> list[int]:
+    """Run queries one after another against the same initialized agent.
+
+    Queries are awaited sequentially rather than gathered: in stateful mode they share one
+    session, and concurrent runs would interleave its history and memory updates. The agent is
+    initialized up front, so a startup failure aborts the batch; a failing query is reported
+    and the batch moves on to the next one.
 
-        # Try to parse as JSON, otherwise treat as a text message
+    Returns:
+        1-based indices of the queries that failed.
+    """
+    await _get_agent(use_db=not stateless)
+
+    failed = []
+    for index, query in enumerate(queries, start=1):
+        logger.info(f"Batch query {index}/{len(queries)}")
         try:
-            request_data = json.loads(query)
-            # If it's valid JSON, ensure it has a 'message' field
-            if "message" not in request_data:
-                request_data = {"message": query}
-        except json.JSONDecodeError:
-            # If not JSON, treat the entire input as a message
-            request_data = {"message": query}
+            await _run_query_async(query, debug=debug, stateless=stateless)
+        except Exception as e:
+            logger.error(f"Batch query {index}/{len(queries)} failed: {e}", exc_info=True)
+            failed.append(index)
+    return failed
 
-        # Add image if provided
-        if image_path:
-            image_file = Path(image_path)
-            if not image_file.exists():
-                console.print(f"[red]✗ Error: Image file not found: {image_path}[/red]")
-                sys.exit(1)
-
-            # Read and encode image (compression handled by pre-hook)
-            logger.info(f"Loading image: {image_file.name}...")
-            with open(image_file, "rb") as f:
-                image_bytes = f.read()
-
-            image_data = base64.b64encode(image_bytes).decode("utf-8")
-
-            # Determine MIME type based on extension
-            ext = image_file.suffix.lower()
-            mime_types = {
-                ".jpg": "image/jpeg",
-                ".jpeg": "image/jpeg",
-                ".png": "image/png",
-                ".gif": "image/gif",
-                ".webp": "image/webp",
-            }
-            mime_type = mime_types.get(ext, "image/jpeg")
-
-            # Add image to request
-            if "images" not in request_data:
-                request_data["images"] = []
-            request_data["images"].append(f"data:{mime_type};base64,{image_data}")
-            logger.info(f"✓ Loaded image: {image_file.name} ({len(image_data) / 1024:.1f} KB base64)")
-
-        # Run the query and get response (async call)
-        response = asyncio.run(agent.arun(input=json.dumps(request_data)))
-
-        logger.info("---")
-        console.print()  # Blank line for separation
-
-        # Display debug info if requested
-        if debug:
-            console.print("[bold cyan]Debug Mode: Full Response[/bold cyan]")
-            console.print("[dim]" + "=" * 60 + "[/dim]")
-            response_dict = response.model_dump() if hasattr(response, "model_dump") else response.__dict__
-            console.print_json(data=response_dict)
-            console.print("[dim]" + "=" * 60 + "[/dim]")
-            console.print()
-
-        # Display response with proper markdown formatting and colors
-        response_text = extract_response_text(response)
-
-        if response_text:
-            # Render as markdown with rich formatting (colors, bold, etc.)
-            console.print(Markdown(response_text))
-        else:
-            # Fallback: print the response as-is
-            console.print("[yellow]No response text found[/yellow]")
 
+def run_batch(batch_path: str, debug: bool = False, stateless: bool = False) -> None:
+    """Execute every query in a file (one per line) with a single agent initialization.
+
+    Args:
+        batch_path: Path to a text file with one query per line; blank lines are skipped.
+        debug: If True, display full JSON response with all fields.
+        stateless: If True, disable persistence (no session memory).
+    """
+    batch_file = Path(batch_path)
+    if not batch_file.exists():
+        _get_console().print(f"[red]✗ Error: Batch file not found: {batch_path}[/red]")
+        sys.exit(1)
+
+    queries = [line.strip() for line in batch_file.read_text(encoding="utf-8").splitlines() if line.strip()]
+    if not queries:
+        _get_console().print(f"[red]✗ Error: No queries found in {batch_path}[/red]")
+        sys.exit(1)
+
+    future = asyncio.run_coroutine_threadsafe(
+        _fail_fast(_run_batch_async(queries, debug=debug, stateless=stateless)), _get_event_loop()
+    )
+    try:
+        failed = future.result()
     except KeyboardInterrupt:
-        logger.info("\nQuery interrupted by user.")
+        future.cancel()
+        logger.info("\nBatch interrupted by user.")
         sys.exit(0)
     except Exception as e:
-        logger.error(f"Query execution failed: {e}", exc_info=True)
+        logger.error(f"Batch execution failed: {e}", exc_info=True)
         sys.exit(1)
 
-
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print('Usage: python query.py [--debug] [--stateless] [--image PATH] "<your query>"')
-        print("")
-        print("Examples:")
-        print('  python query.py "What can I make with chicken and rice?"')
-        print('  python query.py --debug "What can I make with chicken and rice?"')
-        print('  python query.py --stateless "What can I make with chicken and rice?"')
-        print('  python query.py --image images/pasta.png "What can I make with these ingredients?"')
-        print('  python query.py --image images/pasta.png --debug "What can I make with these ingredients?"')
+    if failed:
+        _get_console().print(
+            f"[red]✗ {len(failed)}/{len(queries)} batch queries failed: {', '.join(map(str, failed))}[/red]"
+        )
         sys.exit(1)
 
-    # Check for debug, stateless, and image flags
-    debug_mode = False
-    stateless_mode = False
-    image_path = None
-    argv_start = 1
-
-    while argv_start < len(sys.argv) and sys.argv[argv_start].startswith("--"):
-        if sys.argv[argv_start] == "--debug":
-            debug_mode = True
-            argv_start += 1
-        elif sys.argv[argv_start] == "--stateless":
-            stateless_mode = True
-            argv_start += 1
-        elif sys.argv[argv_start] == "--image":
-            argv_start += 1
-            if argv_start >= len(sys.argv):
-                print("Error: --image flag requires a file path")
-                sys.exit(1)
-            image_path = sys.argv[argv_start]
-            argv_start += 1
-        else:
-            print(f"Unknown flag: {sys.argv[argv_start]}")
-            sys.exit(1)
 
-    if argv_start >= len(sys.argv):
-        print("Error: No query provided")
-        print('Usage: python query.py [--debug] [--stateless] [--image PATH] "<your query>"')
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    """Parse command-line flags and the query text.
+
+    Args:
+        argv: Command-line arguments without the program name.
+
+    Returns:
+        Namespace with debug, stateless, image, batch, and query (list of words).
+    """
+    parser = argparse.ArgumentParser(
+        prog="query.py",
+        description="Run ad hoc queries against the Recipe Recommendation Agent.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""Examples:
+  python query.py "What can I make with chicken and rice?"
+  python query.py --debug "What can I make with chicken and rice?"
+  python query.py --stateless "What can I make with chicken and rice?"
+  python query.py --image images/pasta.png "What can I make with these ingredients?"
+  python query.py --image images/pasta.png --debug "What can I make with these ingredients?"
+  python query.py --batch queries.txt  # One query per line, agent initialized once
+  python query.py --debug -- recipes -without nuts  # "--" ends the flags; later words starting with "-" are query text""",
+    )
+    parser.add_argument("--debug", action="store_true", help="Show full JSON response")
+    parser.add_argument("--stateless", action="store_true", help="No session history (clear memory)")
+    parser.add_argument("--image", metavar="PATH", help="Image file for ingredient detection")
+    parser.add_argument("--batch", metavar="FILE", help="File with one query per line")
+    # Flags may come before or after the query, so a query word starting with "-" must follow "--"
+    parser.add_argument(
+        "query", nargs="*", help='Query text (plain text or JSON); use "--" before words starting with "-"'
+    )
+
+    if not argv:
+        parser.print_help()
         sys.exit(1)
 
-    # Join all arguments after flags as the query (handles queries with spaces)
-    query = " ".join(sys.argv[argv_start:])
+    args, unknown = parser.parse_known_args(argv)
+    if unknown:
+        parser.error(f'unrecognized arguments: {" ".join(unknown)} (put query words starting with "-" after "--")')
+    if args.batch and (args.image or args.query):
+        parser.error("--batch cannot be combined with --image or an inline query")
+    if not args.batch and not args.query:
+        parser.error("No query provided")
+    return args
+
+
+if __name__ == "__main__":
+    args = _parse_args(sys.argv[1:])
+
+    # Use uvloop (installed with uvicorn[standard]) for the query event loop when available
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+    if args.batch:
+        run_batch(args.batch, debug=args.debug, stateless=args.stateless)
+    else:
+        # Join all arguments after flags as the query (handles queries with spaces)
+        query = " ".join(args.query)
 
-    # Run the query function
-    run_query(query, debug=debug_mode, stateless=stateless_mode, image_path=image_path)
+        # Run the query function
+        run_query(query, debug=args.debug, stateless=args.stateless, image_path=args.image)
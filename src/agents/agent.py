@@ -4,22 +4,25 @@ Factory function that initializes and configures the Agno Agent
 with all orchestration settings, tools, pre-hooks, and system instructions.
 """
 
+import asyncio
+import logging
+import math
 import os
+import threading
 import warnings
+from pathlib import Path
+from typing import TYPE_CHECKING
 from agno.agent import Agent
 from agno.models.google import Gemini
 from agno.memory import MemoryManager
 from agno.compression.manager import CompressionManager
 from agno.learn import LearningMachine, LearnedKnowledgeConfig, LearningMode
-from agno.db.sqlite import SqliteDb
-from agno.db.postgres import PostgresDb
-from agno.knowledge.knowledge import Knowledge
-from agno.vectordb.lancedb import LanceDb
-from agno.knowledge.embedder.sentence_transformer import SentenceTransformerEmbedder
 from agno.tools import tool
+from agno.tools.mcp import MCPTools
 
 from src.utils.config import config
 from src.utils.logger import logger
+from src.utils.gemini import get_genai_client
 from src.utils.tracing import initialize_tracing
 from src.models.models import ChatMessage, RecipeResponse, IngredientDetectionOutput
 from src.mcp_tools.ingredients import detect_ingredients_tool
@@ -27,11 +30,155 @@ from src.mcp_tools.spoonacular import SpoonacularMCP
 from src.prompts.prompts import get_system_instructions
 from src.hooks.hooks import get_pre_hooks, get_post_hooks
 
-# Suppress LanceDB fork-safety warning (not using multiprocessing)
+if TYPE_CHECKING:
+    from agno.knowledge.knowledge import Knowledge
+    from sqlalchemy.engine import Engine
+
+# Suppress LanceDB fork-safety warning: the service runs a single process, and the only forks
+# after LanceDB opens are fork+exec for subprocesses (the npx MCP server), which never touch
+# LanceDB state in the child.
 warnings.filterwarnings("ignore", message="lance is not fork-safe")
 
+# LanceDB ANN tuning for the 384-dim MiniLM embeddings: 16 PQ sub-vectors (24 dims each)
+# compress vectors ~24x with little recall loss; 10 probed partitions balance recall and latency
+LANCEDB_NUM_SUB_VECTORS = 16
+LANCEDB_NPROBES = 10
+
+# Local storage directories already created in this process (skips repeat mkdir syscalls)
+_ENSURED_DIRS: set[str] = set()
+
+# Memoized (agent, tracing_db, knowledge) per use_db value; the lock makes concurrent first
+# callers share one initialization instead of racing two MCP handshakes
+_agent_singletons: dict = {}
+# One lock per event loop: an asyncio.Lock binds to the first loop that waits on it, and startup
+# may run on a helper loop (run_sync) before the serving loop, or on a new loop per test
+_agent_locks: dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+
+# Shared knowledge base embedder: reinitializing the agent reuses the loaded model weights
+_embedder = None
+# Open LanceDB handles keyed by (uri, table_name); re-initializing the agent reuses the open
+# table instead of re-reading its Arrow/index metadata
+_vector_dbs: dict = {}
+# Strong references to fire-and-forget tasks (the event loop only keeps weak ones)
+_background_tasks: set = set()
+
+
+def _ensure_dir(path: str) -> None:
+    """Create a local storage directory once per process."""
+    if path not in _ENSURED_DIRS:
+        Path(path).mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+
+
+def _get_embedder():
+    """Return the process-wide knowledge base embedder, creating it on first call."""
+    global _embedder
+    if _embedder is None:
+        from src.utils.embedder import LazySentenceTransformerEmbedder
+
+        # Model loads on first embedding, not at startup; vectors cached on disk by (model, text)
+        _embedder = LazySentenceTransformerEmbedder(
+            cache_path="tmp/embedding_cache.db" if config.EMBEDDING_CACHE else None,
+            model_cache_dir=config.EMBEDDING_MODEL_DIR,
+            backend=config.EMBEDDER_BACKEND,
+            onnx_file_name=config.EMBEDDER_ONNX_FILE if config.EMBEDDER_BACKEND == "onnx" else None,
+            torch_dtype=None if config.EMBEDDER_DTYPE == "float32" else config.EMBEDDER_DTYPE,
+        )
+    return _embedder
+
+
+def _start_embedder_warmup() -> None:
+    """Load the embedding model in a worker thread without delaying startup (best-effort)."""
+
+    async def _warmup() -> None:
+        try:
+            await asyncio.to_thread(_get_embedder().warmup)
+            logger.info("✓ Embedding model warmed up")
+        except Exception as e:
+            logger.warning(f"Embedding model warmup failed: {e}. Model will load on first use.")
+
+    task = asyncio.create_task(_warmup())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _get_vector_db(uri: str, table_name: str):
+    """Return the LanceDb handle for a table, opening it (and maintaining its index) on first call."""
+    key = (uri, table_name)
+    if key not in _vector_dbs:
+        from agno.vectordb.lancedb import LanceDb
+
+        _ensure_dir(uri)
+        vector_db = LanceDb(
+            uri=uri,
+            table_name=table_name,
+            embedder=_get_embedder(),
+            nprobes=LANCEDB_NPROBES,  # IVF partitions probed per query once the ANN index exists
+        )
+        _start_vector_index_maintenance(vector_db)
+        _vector_dbs[key] = vector_db
+    return _vector_dbs[key]
+
+
+def _build_knowledge(db) -> "Knowledge":
+    """Construct the LanceDB-backed knowledge base (blocking: opens the LanceDB table)."""
+    # Imported here so importing this module doesn't pull in LanceDB/pyarrow and the
+    # sentence-transformers/torch stack; sys.modules makes repeat calls free
+    from agno.knowledge.knowledge import Knowledge
 
-async def initialize_knowledge_base(db=None) -> Knowledge:
+    vector_db = _get_vector_db("tmp/lancedb", "recipe_agent_knowledge")
+    return Knowledge(
+        vector_db=vector_db,
+        contents_db=db,  # Persist content metadata to SQLite for AgentOS UI
+    )
+
+
+def _start_vector_index_maintenance(vector_db) -> None:
+    """Build or refresh the knowledge ANN index on a daemon thread.
+
+    Index builds scale with the table size, so they run outside startup (and its
+    STARTUP_TIMEOUT); searches use flat scan or the previous index until the build finishes.
+    """
+    threading.Thread(target=_ensure_vector_index, args=(vector_db,), name="lancedb-index", daemon=True).start()
+
+
+def _ensure_vector_index(vector_db) -> None:
+    """Create an IVF_PQ ANN index once the knowledge table is large enough, or refresh an existing one.
+
+    Below MIN_ROWS_FOR_INDEX a flat scan is fast and exact, so the table is left unindexed.
+    Above it, queries go from O(rows) to probing LANCEDB_NPROBES of sqrt(rows) partitions.
+    An existing index is optimized so rows added since the last run are indexed too.
+    Best-effort: failures are logged and the table keeps using flat search or the existing index.
+
+    Args:
+        vector_db: LanceDb instance wrapping the knowledge table.
+    """
+    table = getattr(vector_db, "table", None)
+    if table is None:
+        return
+    try:
+        row_count = table.count_rows()
+        if table.list_indices():
+            logger.info("Optimizing knowledge base vector index (%d rows)...", row_count)
+            table.optimize()  # Folds unindexed rows into the index and compacts small fragments
+            logger.info("✓ Knowledge base vector index optimized")
+            return
+        if row_count < config.MIN_ROWS_FOR_INDEX:
+            logger.info("Knowledge base has %d rows; using flat search below %d", row_count, config.MIN_ROWS_FOR_INDEX)
+            return
+        logger.info("Building IVF_PQ index for knowledge base (%d rows)...", row_count)
+        table.create_index(
+            metric="cosine",
+            index_type="IVF_PQ",
+            num_partitions=max(1, int(math.sqrt(row_count))),
+            num_sub_vectors=LANCEDB_NUM_SUB_VECTORS,
+        )
+        logger.info("✓ Knowledge base vector index created")
+    except Exception as e:
+        logger.warning(f"Knowledge base vector index not updated: {e}. Searches continue without it.")
+
+
+async def initialize_knowledge_base(db=None) -> "Knowledge":
     """Initialize knowledge base for recipe troubleshooting and learnings.
 
     Uses LanceDB for vector storage and SentenceTransformer embeddings (lightweight, no API calls).
@@ -43,16 +190,11 @@ async def initialize_knowledge_base(db=None) -> Knowledge:
     """
     logger.info("Initializing knowledge base...")
     try:
-        os.makedirs("tmp/lancedb", exist_ok=True)
-        knowledge = Knowledge(
-            vector_db=LanceDb(
-                uri="tmp/lancedb",
-                table_name="recipe_agent_knowledge",
-                embedder=SentenceTransformerEmbedder(),
-            ),
-            contents_db=db,  # Persist content metadata to SQLite for AgentOS UI
-        )
+        # LanceDB open is blocking; run it off the event loop
+        knowledge = await asyncio.to_thread(_build_knowledge, db)
         logger.info("✓ Knowledge base initialized")
+        if config.EMBEDDING_WARMUP:
+            _start_embedder_warmup()
         return knowledge
     except Exception as e:
         logger.warning(f"Knowledge base initialization failed: {e}. Continuing without knowledge base.")
@@ -170,7 +312,7 @@ def _register_tools(mcp_tools):
     else:
         logger.info("Using ingredient detection in pre-hook mode (default)")
 
-    logger.info(f"✓ {len(tools)} tool(s) registered")
+    logger.info("✓ %d tool(s) registered", len(tools))
     return tools
 
 
@@ -189,6 +331,80 @@ async def _initialize_tracing_db():
     return tracing_db
 
 
+def _build_postgres_engine(db_url: str) -> "Engine":
+    """Build a pooled SQLAlchemy engine for PostgreSQL session persistence.
+
+    Keeps DB_POOL_SIZE connections open and reuses them across requests instead of
+    paying a TCP + TLS + auth handshake per session read/write.
+
+    Args:
+        db_url: PostgreSQL connection string.
+
+    Returns:
+        SQLAlchemy Engine with an explicitly sized connection pool.
+    """
+    from sqlalchemy import create_engine
+
+    return create_engine(
+        db_url,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=True,  # Cheap liveness check on checkout instead of failing a request on a dropped connection
+        connect_args={"connect_timeout": config.DB_CONNECT_TIMEOUT},  # Fail fast instead of hanging on a dead host
+    )
+
+
+def _warm_pool(engine: "Engine", size: int) -> None:
+    """Open pool connections up front so the first requests after startup skip the handshake.
+
+    Best-effort: a failure is logged and connections are opened on demand as usual.
+
+    Args:
+        engine: SQLAlchemy engine whose pool should be filled.
+        size: Number of connections to open (0 disables warmup).
+    """
+    connections = []
+    try:
+        for _ in range(size):
+            connections.append(engine.connect())
+        logger.info("✓ PostgreSQL pool warmed with %d connection(s)", len(connections))
+    except Exception as e:
+        logger.warning(f"PostgreSQL pool warmup failed: {e}. Connections will open on demand.")
+    finally:
+        for connection in connections:
+            connection.close()  # Returns the connection to the pool
+
+
+def _build_sqlite_engine(db_file: str) -> "Engine":
+    """Build a SQLAlchemy engine for SQLite session persistence with WAL journaling.
+
+    WAL lets session reads proceed while another request is writing (the default rollback
+    journal serializes them), and synchronous=NORMAL drops the per-commit fsync of the WAL,
+    which is still crash-safe for the database file itself. The remaining default SQLITE_PRAGMAS
+    keep temp tables and hot pages in memory and make a locked writer wait instead of erroring.
+
+    Args:
+        db_file: Path to the SQLite database file.
+
+    Returns:
+        SQLAlchemy Engine that applies the pragmas on every new connection.
+    """
+    from sqlalchemy import create_engine, event
+
+    _ensure_dir(os.path.dirname(db_file) or ".")
+    engine = create_engine(f"sqlite:///{db_file}")
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in config.SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+    return engine
+
+
 def _configure_database(use_db: bool):
     """Configure database for session persistence (SQLite or PostgreSQL).
 
@@ -206,11 +422,19 @@ def _configure_database(use_db: bool):
         return None
 
     if config.DATABASE_URL:
+        # Imported only when PostgreSQL is configured (SQLite deployments skip the Postgres dialect)
+        from agno.db.postgres import PostgresDb
+
         logger.info(f"Using PostgreSQL: {config.DATABASE_URL.split('@')[1] if '@' in config.DATABASE_URL else '...'}")
-        db = PostgresDb(db_url=config.DATABASE_URL, id="recipe_agent_db")
+        logger.info("PostgreSQL pool: size=%d, max_overflow=%d", config.DB_POOL_SIZE, config.DB_MAX_OVERFLOW)
+        engine = _build_postgres_engine(config.DATABASE_URL)
+        _warm_pool(engine, min(config.DB_POOL_WARMUP, config.DB_POOL_SIZE))
+        db = PostgresDb(db_engine=engine, id="recipe_agent_db")
     else:
+        from agno.db.sqlite import SqliteDb
+
         logger.info("Using SQLite database: tmp/recipe_agent_sessions.db")
-        db = SqliteDb(db_file="tmp/recipe_agent_sessions.db", id="recipe_agent_db")
+        db = SqliteDb(db_engine=_build_sqlite_engine("tmp/recipe_agent_sessions.db"), id="recipe_agent_db")
 
     logger.info("✓ Database configured")
     return db
@@ -232,6 +456,7 @@ async def _initialize_managers(db, knowledge):
         model=Gemini(
             id=config.AGENT_MNGT_MODEL,
             api_key=config.GEMINI_API_KEY,
+            client=get_genai_client(),
         ),
         additional_instructions="Focus on extracting user preferences, dietary restrictions, and cuisine preferences for recipe recommendations. Keep memories concise and relevant to cooking/recipe context.",
     )
@@ -242,6 +467,7 @@ async def _initialize_managers(db, knowledge):
         model=Gemini(
             id=config.AGENT_MNGT_MODEL,
             api_key=config.GEMINI_API_KEY,
+            client=get_genai_client(),
         ),
         compress_tool_results_limit=config.TOOL_CALL_LIMIT,
         compress_tool_call_instructions="Summarize tool results focusing on key facts, ingredients, recipes, and cooking information. Remove redundant details while preserving essential recipe data.",
@@ -265,6 +491,7 @@ async def _initialize_managers(db, knowledge):
             model=Gemini(
                 id=config.AGENT_MNGT_MODEL,
                 api_key=config.GEMINI_API_KEY,
+                client=get_genai_client(),
             ),
             # LearnedKnowledge: Agent learns recipe insights and preferences dynamically
             # AGENTIC mode: Agent decides when to save learnings (recommended for recipes)
@@ -294,13 +521,15 @@ def _register_hooks(knowledge):
     """
     logger.info("Step 6a/7: Registering pre-hooks and guardrails...")
     pre_hooks = get_pre_hooks()
-    logger.info(f"✓ {len(pre_hooks)} pre-hooks registered")
+    logger.info("✓ %d pre-hooks registered", len(pre_hooks))
 
     logger.info("Step 6b/7: Registering post-hooks...")
     post_hooks = get_post_hooks(knowledge_base=knowledge)
-    logger.info(
-        f"✓ {len(post_hooks)} post-hooks registered: {[h.__name__ if hasattr(h, '__name__') else str(h) for h in post_hooks]}"
-    )
+    if logger.isEnabledFor(logging.INFO):
+        # Hook names are only collected when the message will actually be emitted
+        logger.info(
+            "✓ %d post-hooks registered: %s", len(post_hooks), [getattr(h, "__name__", str(h)) for h in post_hooks]
+        )
 
     return pre_hooks, post_hooks
 
@@ -330,6 +559,7 @@ def _create_agent(
         model=Gemini(
             id=config.GEMINI_MODEL,
             api_key=config.GEMINI_API_KEY,
+            client=get_genai_client(),  # Shared connection pool across all Gemini models
             temperature=config.TEMPERATURE,  # 0.2 = consistency with some creativity
             max_output_tokens=config.MAX_OUTPUT_TOKENS,  # 8192 supports full response with multiple recipes and instructions (Gemini supports up to 65,536)
             thinking_level=config.THINKING_LEVEL,  # Extended reasoning depth control
@@ -388,40 +618,128 @@ def _create_agent(
         description="Transforms ingredients into recipe recommendations with conversational memory",
     )
 
-    logger.info(f"✓ Agent configured successfully with maximum {config.TOOL_CALL_LIMIT} tool calls per request")
+    logger.info("✓ Agent configured successfully with maximum %d tool calls per request", config.TOOL_CALL_LIMIT)
     return agent
 
 
-async def initialize_recipe_agent(use_db: bool = True) -> Agent:
+async def _initialize_storage(use_db: bool):
+    """Configure the session database, then the knowledge base that persists into it.
+
+    Returns:
+        Tuple of (db, knowledge).
+    """
+    db = await asyncio.to_thread(_configure_database, use_db)
+    knowledge = await initialize_knowledge_base(db=db)
+    return db, knowledge
+
+
+async def initialize_recipe_agent(use_db: bool = True, concurrent_startup: bool = True) -> Agent:
     """Factory function to initialize and configure the recipe recommendation agent (async).
 
-    Orchestrates initialization of all components in sequence:
+    Orchestrates initialization of all components. Steps 1-4 are I/O and model loading
+    (MCP handshake, tracing DB, session DB + knowledge base) and run concurrently in a
+    TaskGroup, bounded by STARTUP_TIMEOUT; the remaining steps depend on their results
+    and run in sequence:
     1. Spoonacular MCP with fail-fast validation
     2. Tracing database for observability
     3. Session persistence database (SQLite or PostgreSQL)
-    4. Knowledge base for learnings and troubleshooting
+    4. Knowledge base for learnings and troubleshooting (after the session database)
     5. Memory, compression, and learning managers (cost-optimized)
     6. Tool registration (MCP + ingredient detection)
     7. Pre-hooks and post-hooks registration
     8. Agent configuration with system instructions
 
+    The result is memoized per use_db for the life of the process, so repeated calls (hot
+    reload, per-worker setup, query.py batch runs) return the same agent without re-running
+    the MCP handshake or knowledge-base setup. Use reset_agent_singleton() to rebuild.
+    Once an agent is cached for use_db, later calls return it as-is and concurrent_startup
+    is ignored.
+
     Args:
         use_db: If True, use persistent database. If False, run stateless without persistence.
+        concurrent_startup: If False, run steps 1-4 one after another (easier to follow in logs when debugging).
 
     Returns:
         Tuple of (Agent, tracing_db, knowledge_base).
 
     Raises:
-        SystemExit: If MCP initialization fails (fail-fast pattern).
+        SystemExit: If MCP initialization fails or startup exceeds STARTUP_TIMEOUT (fail-fast pattern).
+    """
+    if use_db in _agent_singletons:
+        return _agent_singletons[use_db]
+    async with _get_agent_lock():
+        if use_db not in _agent_singletons:
+            _agent_singletons[use_db] = await _build_recipe_agent(use_db, concurrent_startup)
+        return _agent_singletons[use_db]
+
+
+def _get_agent_lock() -> asyncio.Lock:
+    """Return the initialization lock for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    lock = _agent_locks.get(loop)
+    if lock is None:
+        lock = _agent_locks[loop] = asyncio.Lock()
+    return lock
+
+
+async def close_agent_tools() -> None:
+    """Close the MCP sessions held by memoized agents (called on process shutdown)."""
+    for agent, _, _ in _agent_singletons.values():
+        for agent_tool in agent.tools or []:
+            if isinstance(agent_tool, MCPTools):
+                await agent_tool.close()
+
+
+def reset_agent_singleton() -> None:
+    """Forget memoized agents so the next initialize_recipe_agent() call rebuilds them (for tests)."""
+    _agent_singletons.clear()
+    _agent_locks.clear()
+
+
+class _StartupAborted(Exception):
+    """A fail-fast SystemExit from a concurrent startup step, carried as an ordinary exception."""
+
+
+async def _abort_as_error(coro):
+    """Await coro in a TaskGroup child, turning SystemExit into _StartupAborted.
+
+    asyncio re-raises SystemExit from a task out of the event loop itself, which stops the loop
+    instead of failing the awaiting coroutine.
     """
+    try:
+        return await coro
+    except SystemExit as e:
+        raise _StartupAborted from e
+
+
+async def _build_recipe_agent(use_db: bool, concurrent_startup: bool):
+    """Build the agent and its components (see initialize_recipe_agent for the steps)."""
     logger.info("=== Initializing Recipe Recommendation Agent ===")
 
-    # Initialize components in sequence
-    mcp_tools = await _initialize_mcp_tools()
+    try:
+        async with asyncio.timeout(config.STARTUP_TIMEOUT):
+            if concurrent_startup:
+                # Independent steps run concurrently (startup cost is max() instead of sum()).
+                # A fail-fast SystemExit is carried out of the child task as _StartupAborted and
+                # re-raised here, in the caller's task, so it never escapes the event loop itself.
+                try:
+                    async with asyncio.TaskGroup() as tg:
+                        mcp_task = tg.create_task(_abort_as_error(_initialize_mcp_tools()))
+                        tracing_task = tg.create_task(_initialize_tracing_db())
+                        storage_task = tg.create_task(_initialize_storage(use_db))
+                except* _StartupAborted as eg:
+                    raise SystemExit(1) from eg
+                mcp_tools, tracing_db, (db, knowledge) = mcp_task.result(), tracing_task.result(), storage_task.result()
+            else:
+                mcp_tools = await _initialize_mcp_tools()
+                tracing_db = await _initialize_tracing_db()
+                db, knowledge = await _initialize_storage(use_db)
+    except TimeoutError as e:
+        logger.error(f"✗ Agent startup exceeded STARTUP_TIMEOUT ({config.STARTUP_TIMEOUT}s)")
+        raise SystemExit(1) from e
+
+    # Dependent components in sequence
     tools = _register_tools(mcp_tools)
-    tracing_db = await _initialize_tracing_db()
-    db = _configure_database(use_db)
-    knowledge = await initialize_knowledge_base(db=db)
     memory_manager, compression_manager, learning_machine = await _initialize_managers(db, knowledge)
     pre_hooks, post_hooks = _register_hooks(knowledge)
     agent = _create_agent(
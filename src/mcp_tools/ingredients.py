@@ -18,6 +18,7 @@ This module provides two ways to extract ingredients from uploaded images:
 
 Core Functions:
 - fetch_image_bytes(): Get image bytes from URL or directly (async)
+- get_image_mime_type(): Detect JPEG/PNG MIME type from magic bytes (single scan)
 - validate_image_format(): Check JPEG/PNG only
 - validate_image_size(): Check MAX_IMAGE_SIZE_MB limit
 - parse_gemini_response(): Lenient JSON parsing
@@ -29,17 +30,16 @@ Core Functions:
 
 import asyncio
 import base64
-import json
 import re
 from io import BytesIO
 from typing import Optional
 
 import aiohttp
-import filetype
-from google import genai
 from google.genai import types
+from pydantic_core import from_json
 
 from src.utils.config import config
+from src.utils.gemini import get_genai_client
 from src.utils.logger import logger
 from src.models.models import IngredientDetectionOutput
 
@@ -51,6 +51,19 @@ try:
 except ImportError:
     HAS_PIL = False
 
+# JSON object embedded in prose (compiled once, used when direct parse fails)
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Magic-byte signatures of the supported image formats
+_JPEG_SIGNATURE = b"\xff\xd8\xff"
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Vision call config: JSON mode makes Gemini return a bare JSON object (no prose to scrape)
+_VISION_GENERATION_CONFIG = types.GenerateContentConfig(response_mime_type="application/json")
+
+# Shared HTTP sessions for image downloads, one per event loop (see _get_http_session)
+_http_sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
 
 # ============================================================================
 # Error Handling Helpers
@@ -172,6 +185,9 @@ def compress_image(image_bytes: bytes, max_width: int = 1024) -> bytes:
 
     Returns:
         Compressed image bytes (or original if PIL unavailable or size exceeds threshold)
+
+    Note:
+        Synchronous and CPU-bound - async callers run it via asyncio.to_thread.
     """
     if not HAS_PIL:
         logger.debug("PIL not available, skipping image compression")
@@ -179,11 +195,12 @@ def compress_image(image_bytes: bytes, max_width: int = 1024) -> bytes:
 
     # Check if image size is below compression threshold (skip compression for large images)
     size_kb = len(image_bytes) / 1024
-    logger.debug(f"Image size: {size_kb:.1f}KB, threshold: {config.COMPRESS_IMG_THRESHOLD_KB}KB")
+    logger.debug("Image size: %.1fKB, threshold: %sKB", size_kb, config.COMPRESS_IMG_THRESHOLD_KB)
     if size_kb < config.COMPRESS_IMG_THRESHOLD_KB:
         logger.debug(
-            f"Image size {size_kb:.1f}KB below compression threshold "
-            f"({config.COMPRESS_IMG_THRESHOLD_KB}KB), skipping compression"
+            "Image size %.1fKB below compression threshold (%sKB), skipping compression",
+            size_kb,
+            config.COMPRESS_IMG_THRESHOLD_KB,
         )
         return image_bytes
 
@@ -214,20 +231,61 @@ def compress_image(image_bytes: bytes, max_width: int = 1024) -> bytes:
         compressed_size_mb = len(compressed_bytes) / (1024 * 1024)
 
         logger.debug(
-            f"Image compressed: {original_size_mb:.2f}MB → {compressed_size_mb:.2f}MB "
-            f"({(1 - compressed_size_mb / original_size_mb) * 100:.1f}% reduction)"
+            "Image compressed: %.2fMB → %.2fMB (%.1f%% reduction)",
+            original_size_mb,
+            compressed_size_mb,
+            (1 - compressed_size_mb / original_size_mb) * 100,
         )
         return compressed_bytes
 
     return safe_execute_sync(_compress, "Image compression", log_level="warning", default_return=image_bytes)
 
 
+async def _compress_with_mime_type(image_bytes: bytes, mime_type: str) -> tuple[bytes, str]:
+    """Compress image off the event loop and return the MIME type of the result.
+
+    compress_image returns the input object unchanged when it skips compression,
+    otherwise JPEG bytes - so the MIME type is known without re-scanning the output.
+    """
+    compressed = await asyncio.to_thread(compress_image, image_bytes)
+    if compressed is image_bytes:
+        return image_bytes, mime_type
+    return compressed, "image/jpeg"
+
+
+def _get_http_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session for image downloads (created on first use).
+
+    Reusing one session keeps a keep-alive connection pool and DNS cache across requests
+    instead of opening a new pool per image. A session is bound to the loop it was created on,
+    so each running loop gets its own; sessions of loops that have since closed are dropped
+    (their connections died with the loop), and the rest stay open until close_http_session().
+    """
+    loop = asyncio.get_running_loop()
+    session = _http_sessions.get(loop)
+    if session is None or session.closed:
+        for stale_loop in [other for other in _http_sessions if other.is_closed()]:
+            del _http_sessions[stale_loop]
+        session = _http_sessions[loop] = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+    return session
+
+
+async def close_http_session() -> None:
+    """Close the running loop's image download session (called on application shutdown)."""
+    session = _http_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
 async def fetch_image_bytes(image_source: str | bytes) -> Optional[bytes]:
     """Fetch image bytes from URL or return directly if bytes.
 
     Handles multiple image source formats:
     - Direct bytes: Returned as-is
-    - HTTP/HTTPS URLs: Fetched asynchronously (10s timeout)
+    - HTTP/HTTPS URLs: Fetched asynchronously (10s timeout), aborted once MAX_IMAGE_SIZE_MB is exceeded
     - Data URLs (data:image/jpeg;base64,...): Decoded from base64
     - Plain base64 strings: Decoded directly (see _get_image_bytes_from_source)
 
@@ -263,11 +321,25 @@ async def fetch_image_bytes(image_source: str | bytes) -> Optional[bytes]:
                 default_return=None,
             )
 
-        # Handle regular URLs
+        # Handle regular URLs (shared session, pooled keep-alive connections)
+        # Streams the body and stops at MAX_IMAGE_SIZE_MB so oversize downloads never land in memory
         async def _fetch_url():
-            async with aiohttp.ClientSession() as session:
-                async with session.get(image_source, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    return await response.read()
+            max_bytes = config.MAX_IMAGE_SIZE_BYTES
+            async with _get_http_session().get(image_source) as response:
+                if response.content_length is not None and response.content_length > max_bytes:
+                    logger.warning(
+                        f"Image at {image_source} is {response.content_length} bytes, "
+                        f"exceeds limit of {config.MAX_IMAGE_SIZE_MB}MB"
+                    )
+                    return None
+
+                buffer = bytearray()
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    buffer.extend(chunk)
+                    if len(buffer) > max_bytes:
+                        logger.warning(f"Image at {image_source} exceeds limit of {config.MAX_IMAGE_SIZE_MB}MB")
+                        return None
+                return bytes(buffer)
 
         return await safe_execute_async(
             _fetch_url(),
@@ -279,12 +351,31 @@ async def fetch_image_bytes(image_source: str | bytes) -> Optional[bytes]:
     return None
 
 
+def get_image_mime_type(image_bytes: bytes) -> Optional[str]:
+    """Detect image MIME type from magic bytes (JPEG or PNG only).
+
+    Compares the leading magic bytes against the JPEG and PNG signatures
+    (the only accepted formats), so no generic type-detection table is scanned.
+    The processing pipeline calls this once per image and passes the result
+    down to the Gemini call.
+
+    Args:
+        image_bytes: Raw image bytes.
+
+    Returns:
+        "image/jpeg" or "image/png", or None if format is unsupported.
+    """
+    if image_bytes.startswith(_JPEG_SIGNATURE):
+        return "image/jpeg"
+    if image_bytes.startswith(_PNG_SIGNATURE):
+        return "image/png"
+    logger.warning(f"Invalid image format (header: {image_bytes[:8]!r}). Only JPEG and PNG supported.")
+    return None
+
+
 def validate_image_format(image_bytes: bytes) -> bool:
     """Validate image format (JPEG or PNG only).
 
-    Uses filetype library to detect actual file format from magic bytes,
-    not from extension. Supports: JPEG, JPG, PNG.
-
     Args:
         image_bytes: Raw image bytes.
 
@@ -295,17 +386,13 @@ def validate_image_format(image_bytes: bytes) -> bool:
         Returns False on any format other than JPEG/PNG. Caller responsible
         for checking return value and handling validation failure.
     """
-    kind = filetype.guess(image_bytes)
-    if kind is None or kind.extension not in ("jpg", "jpeg", "png"):
-        logger.warning(f"Invalid image format: {kind}. Only JPEG and PNG supported.")
-        return False
-    return True
+    return get_image_mime_type(image_bytes) is not None
 
 
 def validate_image_size(image_bytes: bytes) -> bool:
     """Validate image size against MAX_IMAGE_SIZE_MB.
 
-    Checks raw byte length against configured size limit.
+    Checks raw byte length against the precomputed MAX_IMAGE_SIZE_BYTES limit.
 
     Args:
         image_bytes: Raw image bytes.
@@ -317,8 +404,8 @@ def validate_image_size(image_bytes: bytes) -> bool:
         Returns False if exceeded. Caller responsible for checking return
         value and handling size validation failure.
     """
-    size_mb = len(image_bytes) / (1024 * 1024)
-    if size_mb > config.MAX_IMAGE_SIZE_MB:
+    if len(image_bytes) > config.MAX_IMAGE_SIZE_BYTES:
+        size_mb = len(image_bytes) / (1024 * 1024)
         logger.warning(f"Image size {size_mb:.2f}MB exceeds limit of {config.MAX_IMAGE_SIZE_MB}MB")
         return False
     return True
@@ -328,8 +415,11 @@ def parse_gemini_response(response_text: str) -> Optional[IngredientDetectionOut
     """Parse JSON from Gemini response into validated IngredientDetectionOutput model.
 
     Implements lenient JSON parsing to handle Gemini responses that may include
-    explanatory text before/after the JSON object. Tries multiple parsing strategies:
-    1. Direct JSON.loads() on full response
+    explanatory text before/after the JSON object. Vision calls request JSON mode, so the
+    direct parse normally succeeds and the regex fallback is only a safety net.
+    Parses with pydantic-core's Rust JSON parser (already a pydantic dependency).
+    Tries multiple parsing strategies:
+    1. Direct JSON parse on full response
     2. Regex extraction of JSON object from text
     3. Returns None if both fail
 
@@ -349,12 +439,12 @@ def parse_gemini_response(response_text: str) -> Optional[IngredientDetectionOut
     """
 
     def _parse_json_direct():
-        return json.loads(response_text)
+        return from_json(response_text)
 
     def _parse_json_regex():
-        json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
+        json_match = _JSON_OBJECT_RE.search(response_text)
         if json_match:
-            return json.loads(json_match.group())
+            return from_json(json_match.group())
         return None
 
     # Try direct JSON parse first
@@ -398,7 +488,9 @@ def parse_gemini_response(response_text: str) -> Optional[IngredientDetectionOut
     )
 
 
-async def extract_ingredients_from_image(image_bytes: bytes) -> Optional[IngredientDetectionOutput]:
+async def extract_ingredients_from_image(
+    image_bytes: bytes, mime_type: Optional[str] = None
+) -> Optional[IngredientDetectionOutput]:
     """Call Gemini vision API to extract ingredients from image (single attempt, no retries).
 
     Makes a single API call to Gemini's vision model to analyze food images
@@ -412,6 +504,7 @@ async def extract_ingredients_from_image(image_bytes: bytes) -> Optional[Ingredi
 
     Args:
         image_bytes: Raw image bytes (must be JPEG or PNG format, validated by caller).
+        mime_type: MIME type already detected by caller. If None, detected from image_bytes.
 
     Returns:
         Validated IngredientDetectionOutput with:
@@ -431,27 +524,25 @@ async def extract_ingredients_from_image(image_bytes: bytes) -> Optional[Ingredi
     Note:
         - Single attempt only (no retries here)
         - Assumes caller wraps with extract_ingredients_with_retries for retry logic
-        - Uses asyncio.to_thread to call sync Gemini client in async context
+        - Uses the native async Gemini client (client.aio), no worker thread per call
     """
 
     async def _call_gemini_api():
-        # Determine MIME type based on image format
-        kind = filetype.guess(image_bytes)
-        if kind is None:
+        # Determine MIME type only if caller didn't pass the one it already detected
+        image_mime_type = mime_type or get_image_mime_type(image_bytes)
+        if image_mime_type is None:
             raise ValueError("Unable to determine image format")
 
-        mime_type = "image/jpeg" if kind.extension in ("jpg", "jpeg") else "image/png"
-
-        # Initialize Gemini client
-        client = genai.Client(api_key=config.GEMINI_API_KEY)
+        # Reuse the process-wide Gemini client (warm connection pool, no per-call auth setup)
+        client = get_genai_client()
 
-        # Call vision API with JSON response format
-        response = await asyncio.to_thread(
-            client.models.generate_content,
+        # Call vision API in JSON mode (native async, keeps the event loop free)
+        response = await client.aio.models.generate_content(
             model=config.IMAGE_DETECTION_MODEL,
+            config=_VISION_GENERATION_CONFIG,
             contents=[
                 'Extract all food ingredients from this image. Return ONLY valid JSON with \'ingredients\' list (strings) and \'confidence_scores\' dict mapping ingredient name to confidence (0.0-1.0). Example: {"ingredients": ["tomato", "basil"], "confidence_scores": {"tomato": 0.95, "basil": 0.88}}',
-                types.Part.from_bytes(data=image_bytes, mime_type=mime_type),
+                types.Part.from_bytes(data=image_bytes, mime_type=image_mime_type),
             ],
         )
 
@@ -485,16 +576,14 @@ def filter_ingredients_by_confidence(ingredients: list[str], confidence_scores:
         - Uses config.MIN_INGREDIENT_CONFIDENCE (default: 0.7)
         - Handles missing confidence scores by treating them as 0.0
     """
-    filtered = [
-        ingredient
-        for ingredient in ingredients
-        if confidence_scores.get(ingredient, 0.0) >= config.MIN_INGREDIENT_CONFIDENCE
-    ]
+    # Bind threshold and lookup once instead of re-resolving them per ingredient
+    threshold = config.MIN_INGREDIENT_CONFIDENCE
+    get_score = confidence_scores.get
+    filtered = [ingredient for ingredient in ingredients if get_score(ingredient, 0.0) >= threshold]
 
     if len(filtered) < len(ingredients):
         logger.debug(
-            f"Filtered ingredients: {len(ingredients)} → {len(filtered)} "
-            f"(confidence threshold: {config.MIN_INGREDIENT_CONFIDENCE})"
+            "Filtered ingredients: %d → %d (confidence threshold: %s)", len(ingredients), len(filtered), threshold
         )
 
     return filtered
@@ -511,8 +600,8 @@ async def prepare_and_extract_ingredients(
     used by both _process_single_image (no retries) and detect_ingredients_tool (with retries).
 
     **Pipeline Steps:**
-    1. Validate image format (JPEG/PNG only)
-    2. Validate image size (MAX_IMAGE_SIZE_MB limit)
+    1. Validate image size (MAX_IMAGE_SIZE_MB limit)
+    2. Validate image format (JPEG/PNG only)
     3. Optionally compress for API transmission
     4. Extract ingredients from image (with or without retries)
     5. Filter by confidence threshold (MIN_INGREDIENT_CONFIDENCE)
@@ -533,24 +622,25 @@ async def prepare_and_extract_ingredients(
     Side Effects:
         Logs progress and validation failures.
     """
-    # Validate format
-    if not validate_image_format(image_bytes):
+    # Validate size first (cheapest check, rejects oversize payloads before any inspection)
+    if not validate_image_size(image_bytes):
         return None
 
-    # Validate size
-    if not validate_image_size(image_bytes):
+    # Validate format (magic-byte check, MIME type reused for the API call)
+    mime_type = get_image_mime_type(image_bytes)
+    if mime_type is None:
         return None
 
-    # Optionally compress
+    # Optionally compress (Pillow is CPU-bound, run off the event loop)
     if config.COMPRESS_IMG:
-        logger.debug(f"Image {image_idx + 1}: Compressing for API transmission...")
-        image_bytes = compress_image(image_bytes)
+        logger.debug("Image %d: Compressing for API transmission...", image_idx + 1)
+        image_bytes, mime_type = await _compress_with_mime_type(image_bytes, mime_type)
 
     # Extract ingredients (with or without retries)
     if with_retries:
-        result = await extract_ingredients_with_retries(image_bytes)
+        result = await extract_ingredients_with_retries(image_bytes, mime_type=mime_type)
     else:
-        result = await extract_ingredients_from_image(image_bytes)
+        result = await extract_ingredients_from_image(image_bytes, mime_type=mime_type)
 
     if not result:
         logger.warning(f"Image {image_idx + 1}: Failed to extract ingredients")
@@ -647,8 +737,10 @@ async def _process_single_image(image_source, idx: int) -> Optional[list[str]]:
 
     if ingredients:
         logger.info(
-            f"Image {idx + 1}: Extracted {len(ingredients)} ingredients "
-            f"(confidence threshold: {config.MIN_INGREDIENT_CONFIDENCE})"
+            "Image %d: Extracted %d ingredients (confidence threshold: %s)",
+            idx + 1,
+            len(ingredients),
+            config.MIN_INGREDIENT_CONFIDENCE,
         )
         return ingredients
 
@@ -718,8 +810,10 @@ async def extract_ingredients_pre_hook(
         # Log pre-hook execution context
         session_id = getattr(session, "session_id", None) if session else None
         logger.info(
-            f"Pre-hook: extract_ingredients_pre_hook(session_id={session_id}, "
-            f"user_id={user_id}, debug_mode={debug_mode})"
+            "Pre-hook: extract_ingredients_pre_hook(session_id=%s, user_id=%s, debug_mode=%s)",
+            session_id,
+            user_id,
+            debug_mode,
         )
 
         # Extract ChatMessage data from RunInput
@@ -736,21 +830,21 @@ async def extract_ingredients_pre_hook(
             logger.debug("No images in request, skipping ingredient extraction")
             return
 
-        logger.debug(f"Found {len(images)} image(s), processing in parallel...")
+        logger.debug("Found %d image(s), processing in parallel...", len(images))
 
         # Process all images in parallel for better performance
         tasks = [_process_single_image(image, idx) for idx, image in enumerate(images)]
         results = await asyncio.gather(*tasks, return_exceptions=False)
 
-        # Flatten and deduplicate ingredients from all images
-        all_ingredients = []
+        # Deduplicate ingredients across images incrementally (insertion-ordered dict as ordered set)
+        seen: dict[str, None] = {}
         for result in results:
             if result:
-                all_ingredients.extend(result)
+                seen.update(dict.fromkeys(result))
 
         # Append detected ingredients to message if any were found
-        if all_ingredients:
-            unique_ingredients = list(dict.fromkeys(all_ingredients))  # Remove duplicates, preserve order
+        if seen:
+            unique_ingredients = list(seen)
             ingredient_text = ", ".join(unique_ingredients)
             updated_message = f"{message_text}\n\n[Detected Ingredients] {ingredient_text}"
 
@@ -759,8 +853,10 @@ async def extract_ingredients_pre_hook(
             run_input.input_content = input_data
 
             logger.info(
-                f"Ingredients extracted from image: {unique_ingredients} "
-                f"(total: {len(unique_ingredients)}, confidence threshold: {config.MIN_INGREDIENT_CONFIDENCE})"
+                "Ingredients extracted from image: %s (total: %d, confidence threshold: %s)",
+                unique_ingredients,
+                len(unique_ingredients),
+                config.MIN_INGREDIENT_CONFIDENCE,
             )
 
         # Always clear images from the ChatMessage (whether extraction succeeded or failed)
@@ -783,7 +879,7 @@ async def extract_ingredients_pre_hook(
 
 
 async def extract_ingredients_with_retries(
-    image_bytes: bytes, max_retries: int = 3
+    image_bytes: bytes, max_retries: int = 3, mime_type: Optional[str] = None
 ) -> Optional[IngredientDetectionOutput]:
     """Call Gemini vision API with exponential backoff retry logic (async).
 
@@ -805,6 +901,7 @@ async def extract_ingredients_with_retries(
     Args:
         image_bytes: Raw image bytes to process.
         max_retries: Maximum number of retry attempts (default: 3 = 1s + 2s + 4s = 7s max)
+        mime_type: MIME type already detected by caller, passed through to each attempt.
 
     Returns:
         Validated IngredientDetectionOutput on success.
@@ -824,7 +921,7 @@ async def extract_ingredients_with_retries(
 
     while retry_count < max_retries:
         try:
-            result = await extract_ingredients_from_image(image_bytes)
+            result = await extract_ingredients_from_image(image_bytes, mime_type=mime_type)
             if result:
                 return result
             # If result is None but no exception, retry (might be transient API issue)
@@ -879,7 +976,7 @@ async def detect_ingredients_tool(image_data: str) -> IngredientDetectionOutput:
 
     **Processing:**
     1. Retrieves image bytes from URL, data URL, or base64 (via _get_image_bytes_from_source)
-    2. Validates format (JPEG/PNG) and size constraints
+    2. Validates size and format (JPEG/PNG) constraints
     3. Optionally compresses for API transmission
     4. Extracts ingredients with exponential backoff retries
     5. Filters by confidence threshold
@@ -917,19 +1014,20 @@ async def detect_ingredients_tool(image_data: str) -> IngredientDetectionOutput:
         if not image_bytes:
             raise ValueError("Could not retrieve image bytes from provided data")
 
-        # Explicit validation for tool mode to provide specific error messages
-        if not validate_image_format(image_bytes):
-            raise ValueError("Invalid image format. Only JPEG and PNG are supported.")
-
+        # Explicit validation for tool mode to provide specific error messages (size first, cheapest)
         if not validate_image_size(image_bytes):
             raise ValueError(f"Image too large. Maximum size is {config.MAX_IMAGE_SIZE_MB}MB")
 
-        # Compress if enabled
+        mime_type = get_image_mime_type(image_bytes)
+        if mime_type is None:
+            raise ValueError("Invalid image format. Only JPEG and PNG are supported.")
+
+        # Compress if enabled (Pillow is CPU-bound, run off the event loop)
         if config.COMPRESS_IMG:
-            image_bytes = compress_image(image_bytes)
+            image_bytes, mime_type = await _compress_with_mime_type(image_bytes, mime_type)
 
         # Extract ingredients with retries
-        result = await extract_ingredients_with_retries(image_bytes)
+        result = await extract_ingredients_with_retries(image_bytes, mime_type=mime_type)
         if result is None:
             raise ValueError("Failed to extract ingredients from image. Please try another image.")
 
@@ -1,10 +1,11 @@
 """Spoonacular MCP initialization with connection validation and retry logic.
 
 This module provides the SpoonacularMCP class for initializing external
-Spoonacular MCP tool with proper error handling and exponential backoff retries (async).
+Spoonacular MCP tool with proper error handling and jittered exponential backoff retries (async).
 """
 
 import asyncio
+import random
 from typing import Optional
 
 from agno.tools.mcp import MCPTools
@@ -14,8 +15,8 @@ from src.utils.logger import logger
 class SpoonacularMCP:
     """Initialize and validate Spoonacular MCP connection.
 
-    Manages connection validation with exponential backoff retry logic
-    to handle transient failures gracefully.
+    Manages connection validation with jittered exponential backoff retry logic
+    to handle transient failures gracefully without synchronized retry storms.
     """
 
     def __init__(
@@ -24,6 +25,7 @@ class SpoonacularMCP:
         max_retries: int = 3,
         retry_delays: Optional[list[int]] = None,
         include_tools: Optional[list[str]] = None,
+        jitter: bool = True,
     ) -> None:
         """Initialize SpoonacularMCP with configuration.
 
@@ -33,6 +35,8 @@ class SpoonacularMCP:
             retry_delays: List of delays in seconds for each retry. If None, defaults to [1, 2, 4].
             include_tools: List of tool names to include. If None, all tools are included.
                 Default: ["search_recipes", "get_recipe_information"]
+            jitter: Randomize each retry delay to 50-150% of its base value (default: True).
+                Prevents workers that failed together from retrying in lockstep.
 
         Raises:
             ValueError: If api_key is None or empty string.
@@ -44,6 +48,14 @@ class SpoonacularMCP:
         self.max_retries = max_retries
         self.retry_delays = retry_delays or [1, 2, 4]
         self.include_tools = include_tools or ["search_recipes", "get_recipe_information"]
+        self.jitter = jitter
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Compute the delay before the next retry, applying jitter if enabled."""
+        base = self.retry_delays[attempt] if attempt < len(self.retry_delays) else 4
+        if not self.jitter:
+            return base
+        return random.uniform(base * 0.5, base * 1.5)
 
     async def initialize(self) -> MCPTools:
         """Initialize MCP with connection validation and retries (async).
@@ -90,9 +102,9 @@ class SpoonacularMCP:
 
                 # If this is not the last attempt, retry with delay
                 if attempt < self.max_retries - 1:
-                    delay = self.retry_delays[attempt] if attempt < len(self.retry_delays) else 4
+                    delay = self._retry_delay(attempt)
                     logger.warning(
-                        f"Connection failed, retrying in {delay}s... (attempt {attempt + 1}/{self.max_retries})"
+                        f"Connection failed, retrying in {delay:.1f}s... (attempt {attempt + 1}/{self.max_retries})"
                     )
                     await asyncio.sleep(delay)
 
@@ -3,8 +3,11 @@
 Provides a factory function to generate system instructions with configurable parameters.
 Instructions guide the LLM to generate structured responses matching RecipeResponse schema.
 Supports two modes: Spoonacular MCP (external API) and Internal LLM Knowledge (no external tools).
+Rendered instructions are memoized per parameter set, so the multi-KB prompt is built once per process.
 """
 
+from functools import lru_cache
+
 
 def _get_spoonacular_section(max_recipes: int, max_tool_calls: int) -> str:
     """Generate Spoonacular MCP-specific instructions section.
@@ -352,6 +355,7 @@ If the ingredient combination is unusual or difficult:
 """
 
 
+@lru_cache(maxsize=8)
 def get_system_instructions(
     max_recipes: int = 10,
     max_tool_calls: int = 5,
@@ -359,6 +363,9 @@ def get_system_instructions(
 ) -> str:
     """Generate system instructions with dynamic configuration values.
 
+    Memoized: configuration values are fixed for the process lifetime, so every agent
+    initialization reuses the same rendered string instead of re-running the templates.
+
     Args:
         max_recipes: Maximum number of recipes to return (1-100, default: 10)
         max_tool_calls: Maximum tool calls allowed before using LLM knowledge (default: 5)
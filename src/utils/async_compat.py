@@ -0,0 +1,49 @@
+"""Run coroutines from synchronous code, whether or not an event loop is already running.
+
+asyncio.run() raises RuntimeError when called from inside a running loop, which is the case
+when app.py is imported by a server that loads the application from within its own loop
+(e.g. `uvicorn app:app`). run_sync() falls back to a short-lived loop on a helper thread there,
+so module-level startup code works the same under `python app.py` and under an import string.
+"""
+
+import asyncio
+import threading
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion and return its result.
+
+    Uses asyncio.run() when no loop is running in this thread; otherwise runs the coroutine on a
+    new event loop in a dedicated thread and blocks until it finishes. Exceptions (including
+    SystemExit from fail-fast initialization) are re-raised in the caller.
+
+    Args:
+        coro: Coroutine to execute.
+
+    Returns:
+        The coroutine's return value.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result: list = []
+    error: list[BaseException] = []
+
+    def _runner() -> None:
+        try:
+            result.append(asyncio.run(coro))
+        except BaseException as e:  # propagate everything, including SystemExit, to the caller
+            error.append(e)
+
+    thread = threading.Thread(target=_runner, name="run-sync", daemon=True)
+    thread.start()
+    thread.join()
+
+    if error:
+        raise error[0]
+    return result[0]
@@ -2,16 +2,20 @@
 
 Loads environment variables from system environment and .env file.
 Priority order: system environment > .env file > hardcoded defaults
+Set LOAD_DOTENV=false in production (real env vars) to skip reading .env at startup.
 """
 
 import os
+import re
 from typing import Optional
 
 from dotenv import load_dotenv
 
 
 # Load .env file (if exists, silently continues if missing)
-load_dotenv()
+# Skipped when LOAD_DOTENV=false (production deployments that inject real environment variables)
+if os.getenv("LOAD_DOTENV", "true").lower() in ("true", "1", "yes"):
+    load_dotenv()
 
 
 class Config:
@@ -44,6 +48,8 @@ class Config:
         self.MAX_RECIPES: int = int(os.getenv("MAX_RECIPES", "10"))
         # Maximum image size (in MB) that can be processed. Default: 5 MB
         self.MAX_IMAGE_SIZE_MB: int = int(os.getenv("MAX_IMAGE_SIZE_MB", "5"))
+        # Same limit in bytes, derived once so per-image checks are a single integer compare
+        self.MAX_IMAGE_SIZE_BYTES: int = self.MAX_IMAGE_SIZE_MB * 1024 * 1024
         # Minimum confidence score (0.0 - 1.0) for ingredient detection. Default: 0.7
         self.MIN_INGREDIENT_CONFIDENCE: float = float(os.getenv("MIN_INGREDIENT_CONFIDENCE", "0.7"))
         # Image Detection Mode: "pre-hook" or "tool"
@@ -61,6 +67,28 @@ class Config:
         self.OUTPUT_FORMAT: str = os.getenv("OUTPUT_FORMAT", "json")
         # Database URL: Optional database connection string for persistent storage for production use
         self.DATABASE_URL: Optional[str] = os.getenv("DATABASE_URL")
+        # PostgreSQL Connection Pool (only used when DATABASE_URL is set)
+        # DB_POOL_SIZE: Persistent connections kept open and reused across requests (avoids TCP+TLS+auth per query)
+        self.DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+        # DB_MAX_OVERFLOW: Extra connections allowed during bursts (closed when returned to the pool)
+        self.DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        # DB_POOL_RECYCLE: Seconds before a pooled connection is recycled (avoids server-side idle disconnects)
+        self.DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "300"))
+        # DB_CONNECT_TIMEOUT: Seconds to wait when opening a new connection before failing
+        self.DB_CONNECT_TIMEOUT: int = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+        # DB_POOL_WARMUP: Connections opened at startup (capped at DB_POOL_SIZE) so the first requests skip the handshake
+        self.DB_POOL_WARMUP: int = int(os.getenv("DB_POOL_WARMUP", "2"))
+        # SQLITE_PRAGMAS: Semicolon-separated name=value pragmas applied to every SQLite session connection
+        # Defaults: WAL + NORMAL sync, in-memory temp tables, 64MB page cache, 256MB mmap reads, 5s lock wait
+        self.SQLITE_PRAGMAS: list[str] = [
+            pragma.strip()
+            for pragma in os.getenv(
+                "SQLITE_PRAGMAS",
+                "journal_mode=WAL;synchronous=NORMAL;temp_store=MEMORY;"
+                "cache_size=-65536;mmap_size=268435456;busy_timeout=5000",
+            ).split(";")
+            if pragma.strip()
+        ]
         # Tracing Configuration.
         # ENABLE_TRACING: Enable/disable tracing of agent interactions
         self.ENABLE_TRACING: bool = os.getenv("ENABLE_TRACING", "true").lower() in ("true", "1", "yes")
@@ -118,6 +146,8 @@ class Config:
         self.DELAY_BETWEEN_RETRIES: int = int(os.getenv("DELAY_BETWEEN_RETRIES", "2"))
         # EXPONENTIAL_BACKOFF: Enable exponential backoff for rate limit handling
         self.EXPONENTIAL_BACKOFF: bool = os.getenv("EXPONENTIAL_BACKOFF", "true").lower() in ("true", "1", "yes")
+        # STARTUP_TIMEOUT: Seconds allowed for concurrent agent startup (MCP, tracing, DB, knowledge base) before failing fast
+        self.STARTUP_TIMEOUT: float = float(os.getenv("STARTUP_TIMEOUT", "120"))
 
         # Agent Memory & History Settings - control context enrichment and knowledge management
         # ====================================================================================
@@ -192,6 +222,25 @@ class Config:
         # Recommended: True when knowledge base is available, False for simple stateless agents
         self.SEARCH_KNOWLEDGE: bool = os.getenv("SEARCH_KNOWLEDGE", "true").lower() in ("true", "1", "yes")
 
+        # EMBEDDING_CACHE: Persist knowledge base embeddings in tmp/embedding_cache.db keyed by (model, text hash)
+        # Benefits: Re-ingested chunks and repeated searches skip the embedding model's forward pass across restarts
+        self.EMBEDDING_CACHE: bool = os.getenv("EMBEDDING_CACHE", "true").lower() in ("true", "1", "yes")
+        # EMBEDDING_MODEL_DIR: Where embedding model weights are downloaded/read (default: Hugging Face cache)
+        # Point workers at one pre-populated directory (e.g. /dev/shm/st_cache) to share page-cached weights
+        self.EMBEDDING_MODEL_DIR: Optional[str] = os.getenv("EMBEDDING_MODEL_DIR") or None
+        # EMBEDDER_BACKEND: Embedding inference backend: "torch" (FP32 PyTorch) or "onnx" (ONNX Runtime)
+        # Benefits: ONNX with an INT8-quantized export is several times faster on CPU with a small recall loss
+        self.EMBEDDER_BACKEND: str = os.getenv("EMBEDDER_BACKEND", "torch").lower()
+        # EMBEDDER_ONNX_FILE: ONNX export loaded when EMBEDDER_BACKEND=onnx (default: AVX-512 VNNI INT8 quantized)
+        self.EMBEDDER_ONNX_FILE: str = os.getenv("EMBEDDER_ONNX_FILE", "onnx/model_qint8_avx512_vnni.onnx")
+        # EMBEDDER_DTYPE: Weight dtype for the torch backend: "float32" (default) or "bfloat16" (use on GPUs)
+        self.EMBEDDER_DTYPE: str = os.getenv("EMBEDDER_DTYPE", "float32").lower()
+        # EMBEDDING_WARMUP: Load the embedding model in the background right after startup (default: load on first use)
+        # Benefits: The first knowledge base search/write doesn't pay model load latency; costs memory even if unused
+        self.EMBEDDING_WARMUP: bool = os.getenv("EMBEDDING_WARMUP", "false").lower() in ("true", "1", "yes")
+        # MIN_ROWS_FOR_INDEX: Knowledge base rows before an IVF_PQ vector index is built after startup (flat search below)
+        self.MIN_ROWS_FOR_INDEX: int = int(os.getenv("MIN_ROWS_FOR_INDEX", "1000"))
+
         # SEARCH_SESSION_HISTORY: Enable searching across multiple past sessions for context
         # Benefits: Access to learnings and preferences from previous conversations
         # Trade-offs: Increases context size, may include irrelevant information from old sessions
@@ -284,10 +333,30 @@ class Config:
             raise ValueError(f"MAX_OUTPUT_TOKENS must be at least 512, got: {self.MAX_OUTPUT_TOKENS}")
         if self.THINKING_LEVEL not in (None, "low", "high"):
             raise ValueError(f"THINKING_LEVEL must be 'off', 'low', or 'high', got: {self.THINKING_LEVEL}")
+        if self.DB_POOL_SIZE < 1:
+            raise ValueError(f"DB_POOL_SIZE must be at least 1, got: {self.DB_POOL_SIZE}")
+        if self.DB_MAX_OVERFLOW < 0:
+            raise ValueError(f"DB_MAX_OVERFLOW must be non-negative, got: {self.DB_MAX_OVERFLOW}")
+        if self.DB_CONNECT_TIMEOUT < 1:
+            raise ValueError(f"DB_CONNECT_TIMEOUT must be at least 1, got: {self.DB_CONNECT_TIMEOUT}")
+        if self.DB_POOL_WARMUP < 0:
+            raise ValueError(f"DB_POOL_WARMUP must be non-negative, got: {self.DB_POOL_WARMUP}")
+        for pragma in self.SQLITE_PRAGMAS:
+            # Pragmas are interpolated into SQL, so only plain name=value pairs are accepted
+            if not re.fullmatch(r"\w+=-?\w+", pragma):
+                raise ValueError(f"SQLITE_PRAGMAS entries must be name=value pairs, got: {pragma}")
         if self.MAX_RETRIES < 1:
             raise ValueError(f"MAX_RETRIES must be at least 1, got: {self.MAX_RETRIES}")
         if self.DELAY_BETWEEN_RETRIES < 1:
             raise ValueError(f"DELAY_BETWEEN_RETRIES must be at least 1 second, got: {self.DELAY_BETWEEN_RETRIES}")
+        if self.STARTUP_TIMEOUT <= 0:
+            raise ValueError(f"STARTUP_TIMEOUT must be positive, got: {self.STARTUP_TIMEOUT}")
+        if self.EMBEDDER_BACKEND not in ("torch", "onnx"):
+            raise ValueError(f"EMBEDDER_BACKEND must be 'torch' or 'onnx', got: {self.EMBEDDER_BACKEND}")
+        if self.EMBEDDER_DTYPE not in ("float32", "bfloat16"):
+            raise ValueError(f"EMBEDDER_DTYPE must be 'float32' or 'bfloat16', got: {self.EMBEDDER_DTYPE}")
+        if self.MIN_ROWS_FOR_INDEX < 1:
+            raise ValueError(f"MIN_ROWS_FOR_INDEX must be at least 1, got: {self.MIN_ROWS_FOR_INDEX}")
 
 
 # Create module-level config instance and validate immediately
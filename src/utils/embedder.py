@@ -0,0 +1,235 @@
+"""Lazily loaded, cached SentenceTransformer embedder for the knowledge base.
+
+SentenceTransformerEmbedder loads its model (torch weights, device init) as soon as it is
+constructed, so every startup paid for it even when the session never searched or wrote the
+knowledge base. LazySentenceTransformerEmbedder keeps the same configuration and interface but
+loads the model on the first embedding call; LanceDB only needs `dimensions` up front.
+
+Recently embedded single texts (typically knowledge search queries) are kept in a bounded
+in-memory LRU, so a repeated query skips both the model and the SQLite lookup.
+
+With `cache_path` set, embeddings are also stored in a SQLite file keyed by a hash of the model
+id and the text, so re-ingested chunks and repeated queries skip the forward pass across restarts.
+Batch ingestion encodes all cache misses in a single model.encode() call.
+
+backend="onnx" runs the model with ONNX Runtime instead of PyTorch (sentence-transformers>=3.2
+with the onnx extra); pointing onnx_file_name at a dynamically quantized INT8 export trades a
+small recall loss for several times the CPU throughput and a quarter of the weight memory.
+torch_dtype="bfloat16" loads the PyTorch weights in bf16, which keeps FP32's range and uses
+tensor cores on GPUs.
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from agno.knowledge.embedder.sentence_transformer import SentenceTransformerEmbedder
+
+from src.utils.logger import logger
+
+# Bound parameters per SQLite statement (the library default limit on older builds is 999)
+_SQLITE_MAX_PARAMS = 900
+
+
+@dataclass
+class LazySentenceTransformerEmbedder(SentenceTransformerEmbedder):
+    """SentenceTransformerEmbedder that defers loading the model until it is first needed."""
+
+    # SQLite file for the persistent embedding cache (None disables caching)
+    cache_path: Optional[str] = None
+    # Directory holding downloaded model weights (None uses the Hugging Face default cache)
+    model_cache_dir: Optional[str] = None
+    # Batch ingestion: let agno's vector DBs embed documents through get_embeddings_batch
+    enable_batch: bool = True
+    batch_size: int = 64
+    # Inference backend: "torch" (default) or "onnx"
+    backend: str = "torch"
+    # Most recent single-text embeddings kept in memory (0 disables the in-memory cache)
+    memory_cache_size: int = 4096
+    # ONNX model file inside the model repo (e.g. an INT8 export); None uses the default export
+    onnx_file_name: Optional[str] = None
+    # Weight dtype for the torch backend (e.g. "bfloat16"); None keeps the model's FP32 weights
+    torch_dtype: Optional[str] = None
+
+    def __post_init__(self):
+        """Skip the eager model load done by the parent class."""
+        self._model_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._cache_conn: Optional[sqlite3.Connection] = None
+        self._memory_cache: OrderedDict[str, list[float]] = OrderedDict()
+
+    def _ensure_model(self) -> None:
+        """Load the SentenceTransformer model once (thread-safe)."""
+        if self.sentence_transformer_client is not None:
+            return
+        with self._model_lock:
+            if self.sentence_transformer_client is None:
+                from sentence_transformers import SentenceTransformer
+
+                kwargs = {}
+                if self.backend != "torch":
+                    kwargs["backend"] = self.backend
+                    if self.onnx_file_name:
+                        kwargs["model_kwargs"] = {"file_name": self.onnx_file_name}
+                elif self.torch_dtype:
+                    kwargs["model_kwargs"] = {"torch_dtype": self.torch_dtype}
+                logger.info(f"Loading embedding model {self.id} ({self.backend})...")
+                self.sentence_transformer_client = SentenceTransformer(
+                    model_name_or_path=self.id, cache_folder=self.model_cache_dir, **kwargs
+                )
+
+    def warmup(self) -> None:
+        """Load the model and run one encode so the first real embedding skips load latency.
+
+        Blocking; call from a worker thread. The warmup vector is not written to the cache.
+        """
+        self._ensure_model()
+        self.sentence_transformer_client.encode(["warmup"], show_progress_bar=False)
+
+    def _get_cache_conn(self) -> sqlite3.Connection:
+        """Open the cache database on first use (callers hold _cache_lock)."""
+        if self._cache_conn is None:
+            conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS embedding_cache (key BLOB PRIMARY KEY, vector BLOB NOT NULL)")
+            self._cache_conn = conn
+        return self._cache_conn
+
+    def _cache_key(self, text: str) -> bytes:
+        """Content-addressed key: the same text under a different model is a different entry.
+
+        Non-default backends and dtypes produce slightly different vectors, so they get their own entries.
+        """
+        if self.backend != "torch":
+            model = f"{self.id}|{self.backend}|{self.onnx_file_name}"
+        elif self.torch_dtype:
+            model = f"{self.id}|{self.torch_dtype}"
+        else:
+            model = self.id
+        return hashlib.sha256(f"{model}\0{text}".encode()).digest()
+
+    def _cache_get_many(self, keys: list[bytes]) -> dict[bytes, list[float]]:
+        """Look up cached vectors for keys with one query per chunk (SQLite caps bound parameters)."""
+        found: dict[bytes, list[float]] = {}
+        with self._cache_lock:
+            conn = self._get_cache_conn()
+            for start in range(0, len(keys), _SQLITE_MAX_PARAMS):
+                chunk = keys[start : start + _SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(f"SELECT key, vector FROM embedding_cache WHERE key IN ({placeholders})", chunk)
+                found.update((key, array("f", vector).tolist()) for key, vector in rows)
+        return found
+
+    def _cache_put_many(self, items: list[tuple[bytes, list[float]]]) -> None:
+        """Store vectors for keys in a single transaction."""
+        with self._cache_lock:
+            conn = self._get_cache_conn()
+            conn.executemany(
+                "INSERT OR IGNORE INTO embedding_cache (key, vector) VALUES (?, ?)",
+                [(key, array("f", embedding).tobytes()) for key, embedding in items],
+            )
+            conn.commit()
+
+    def _memory_get(self, text: str) -> Optional[list[float]]:
+        """Return the in-memory embedding for text, marking it most recently used."""
+        with self._cache_lock:
+            embedding = self._memory_cache.get(text)
+            if embedding is not None:
+                self._memory_cache.move_to_end(text)
+            return embedding
+
+    def _memory_put(self, text: str, embedding: list[float]) -> None:
+        """Remember an embedding, evicting the least recently used entry when full."""
+        with self._cache_lock:
+            self._memory_cache[text] = embedding
+            self._memory_cache.move_to_end(text)
+            if len(self._memory_cache) > self.memory_cache_size:
+                self._memory_cache.popitem(last=False)
+
+    def _encode(self, texts: list[str]) -> list[list[float]]:
+        """Run the loaded model over texts with the parent's encode options (prompt, normalization).
+
+        Single-text and batch embedding both go through here, so a text gets the same vector
+        whichever path (and whichever cache entry) produced it.
+        """
+        return self.sentence_transformer_client.encode(
+            texts,
+            prompt=self.prompt,
+            normalize_embeddings=self.normalize_embeddings,
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+        ).tolist()
+
+    def _embed(self, text):
+        """Return the cached embedding for text, or compute it with the model and cache it."""
+        remember = self.memory_cache_size > 0 and isinstance(text, str)
+        if remember:
+            embedding = self._memory_get(text)
+            if embedding is not None:
+                return embedding
+
+        key = self._cache_key(text) if self.cache_path and isinstance(text, str) else None
+        embedding = self._cache_get_many([key]).get(key) if key is not None else None
+        if embedding is None:
+            self._ensure_model()
+            embedding = self._encode([text])[0] if isinstance(text, str) else self._encode(text)
+            if key is not None and embedding:
+                self._cache_put_many([(key, embedding)])
+
+        if remember and embedding:
+            self._memory_put(text, embedding)
+        return embedding
+
+    def get_embeddings_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed many texts: cache hits in one lookup, all misses in one batched model.encode() call.
+
+        Batching amortizes the per-call Python/torch overhead across texts, which is most of the
+        cost for short knowledge-base chunks on CPU.
+
+        Args:
+            texts: Texts to embed.
+
+        Returns:
+            Embeddings in the same order as texts.
+        """
+        keys = [self._cache_key(text) for text in texts] if self.cache_path else []
+        cached = self._cache_get_many(keys) if keys else {}
+        embeddings: list = [cached.get(key) for key in keys] if keys else [None] * len(texts)
+
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            self._ensure_model()
+            vectors = self._encode([texts[i] for i in missing])
+            for i, vector in zip(missing, vectors):
+                embeddings[i] = vector
+            if keys:
+                self._cache_put_many([(keys[i], embeddings[i]) for i in missing])
+        return embeddings
+
+    def get_embedding(self, text):
+        """Embed text, serving from the cache or loading the model first if needed."""
+        return self._embed(text)
+
+    def get_embedding_and_usage(self, text):
+        """Embed text; a local model reports no usage."""
+        return self._embed(text), None
+
+    async def async_get_embedding(self, text):
+        """Embed text asynchronously (model load, cache I/O and encoding run in a worker thread)."""
+        return await asyncio.to_thread(self._embed, text)
+
+    async def async_get_embedding_and_usage(self, text):
+        """Embed text asynchronously; a local model reports no usage."""
+        return await asyncio.to_thread(self._embed, text), None
+
+    async def async_get_embeddings_batch_and_usage(self, texts):
+        """Embed many texts asynchronously in one batch; a local model reports no usage."""
+        embeddings = await asyncio.to_thread(self.get_embeddings_batch, texts)
+        return embeddings, [None] * len(embeddings)
@@ -0,0 +1,44 @@
+"""Shared Google GenAI client for all Gemini calls.
+
+A single genai.Client owns the HTTP connection pools (one aiohttp session per event loop),
+so sharing it across the agent model, the management models, and vision ingredient detection
+keeps TLS connections and DNS lookups warm between turns instead of rebuilding them per client.
+warm_up_genai_client() opens that connection at server startup.
+"""
+
+from functools import lru_cache
+
+from google import genai
+
+from src.utils.config import config
+from src.utils.logger import logger
+
+
+@lru_cache(maxsize=1)
+def get_genai_client() -> genai.Client:
+    """Return the process-wide GenAI client (created on first use).
+
+    Returns:
+        genai.Client: Client authenticated with GEMINI_API_KEY.
+    """
+    return genai.Client(api_key=config.GEMINI_API_KEY)
+
+
+async def warm_up_genai_client() -> None:
+    """Open the shared client's connection to the Gemini API ahead of the first request.
+
+    Fetches model metadata (no tokens billed) so DNS, TCP and TLS setup happen at startup
+    on the serving event loop rather than on the first user request. Failures are logged
+    and ignored: the first request simply pays the handshake instead.
+    """
+    try:
+        await get_genai_client().aio.models.get(model=config.GEMINI_MODEL)
+        logger.debug("Gemini client connection warmed up")
+    except Exception as e:
+        logger.debug(f"Gemini client warm-up skipped: {e}")
+
+
+async def close_genai_client() -> None:
+    """Close the shared client's async HTTP sessions, if the client was ever created (called on shutdown)."""
+    if get_genai_client.cache_info().currsize:
+        await get_genai_client().aio.aclose()
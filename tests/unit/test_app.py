@@ -9,7 +9,7 @@ Tests verify:
 """
 
 import pytest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from src.utils.config import config
 
@@ -63,6 +63,178 @@ class TestAgentConfiguration:
         functions = [node.name for node in tree.body if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
         assert "initialize_recipe_agent" in functions
 
+    @pytest.mark.asyncio
+    async def test_initialize_recipe_agent_memoized(self):
+        """Test the agent is built once per use_db, including concurrent first calls, until reset."""
+        import asyncio
+
+        from src.agents import agent as agent_module
+
+        async def _build(use_db, concurrent_startup):
+            await asyncio.sleep(0)  # Let concurrent callers interleave
+            return object()
+
+        agent_module.reset_agent_singleton()
+        try:
+            with patch.object(agent_module, "_build_recipe_agent", side_effect=_build) as mock_build:
+                first, second = await asyncio.gather(
+                    agent_module.initialize_recipe_agent(use_db=True),
+                    agent_module.initialize_recipe_agent(use_db=True),
+                )
+                third = await agent_module.initialize_recipe_agent(use_db=True)
+                assert first is second is third
+                assert mock_build.call_count == 1
+
+                stateless = await agent_module.initialize_recipe_agent(use_db=False)
+                assert stateless is not first
+                assert mock_build.call_count == 2
+
+                agent_module.reset_agent_singleton()
+                rebuilt = await agent_module.initialize_recipe_agent(use_db=True)
+                assert rebuilt is not first
+                assert mock_build.call_count == 3
+        finally:
+            agent_module.reset_agent_singleton()
+
+    def test_initialize_recipe_agent_across_event_loops(self):
+        """Test concurrent first calls on a second event loop don't hit a lock bound to the first."""
+        import asyncio
+
+        from src.agents import agent as agent_module
+
+        async def _build(use_db, concurrent_startup):
+            await asyncio.sleep(0)
+            return object()
+
+        async def _init_twice(use_db):
+            return await asyncio.gather(
+                agent_module.initialize_recipe_agent(use_db=use_db),
+                agent_module.initialize_recipe_agent(use_db=use_db),
+            )
+
+        agent_module.reset_agent_singleton()
+        try:
+            with patch.object(agent_module, "_build_recipe_agent", side_effect=_build) as mock_build:
+                asyncio.run(_init_twice(use_db=True))
+                asyncio.run(_init_twice(use_db=False))
+
+            assert mock_build.call_count == 2
+        finally:
+            agent_module.reset_agent_singleton()
+
+    def test_mcp_failure_raises_system_exit_in_caller_task(self):
+        """Test a fail-fast MCP error in concurrent startup reaches the awaiting coroutine, not the loop."""
+        import asyncio
+
+        from src.agents import agent as agent_module
+
+        async def _startup():
+            try:
+                await agent_module._build_recipe_agent(use_db=False, concurrent_startup=True)
+            except SystemExit as e:
+                return e.code
+
+        with (
+            patch.object(agent_module, "_initialize_mcp_tools", side_effect=SystemExit(1)),
+            patch.object(agent_module, "_initialize_tracing_db", side_effect=lambda: asyncio.sleep(10)),
+            patch.object(agent_module, "_initialize_storage", side_effect=lambda use_db: asyncio.sleep(10)),
+        ):
+            assert asyncio.run(_startup()) == 1
+
+    @pytest.mark.asyncio
+    async def test_embedder_warmup_runs_in_background(self):
+        """Test _start_embedder_warmup loads the embedder from a background task."""
+        import asyncio
+
+        from src.agents import agent as agent_module
+
+        with patch.object(agent_module, "_get_embedder") as mock_get_embedder:
+            agent_module._start_embedder_warmup()
+            await asyncio.gather(*agent_module._background_tasks)
+
+        mock_get_embedder.return_value.warmup.assert_called_once()
+
+    def test_embedder_warmup_is_plain_function(self):
+        """Test _start_embedder_warmup is a plain helper, not an agent tool."""
+        import inspect
+
+        from src.agents import agent as agent_module
+
+        assert inspect.isfunction(agent_module._start_embedder_warmup)
+
+    def test_detect_image_ingredients_is_tool(self):
+        """Test detect_image_ingredients is registered as an agent tool."""
+        from agno.tools.function import Function
+
+        from src.agents import agent as agent_module
+
+        assert isinstance(agent_module.detect_image_ingredients, Function)
+
+
+class TestKnowledgeIndex:
+    """Tests for knowledge base vector index maintenance."""
+
+    @staticmethod
+    def _vector_db(row_count: int, indices: list):
+        """Build a LanceDb stand-in whose table reports the given size and indices."""
+        table = Mock()
+        table.count_rows.return_value = row_count
+        table.list_indices.return_value = indices
+        return Mock(table=table)
+
+    def test_small_table_left_unindexed(self, monkeypatch):
+        """Test tables below MIN_ROWS_FOR_INDEX keep flat search."""
+        from src.agents import agent as agent_module
+
+        monkeypatch.setattr(config, "MIN_ROWS_FOR_INDEX", 1000)
+        vector_db = self._vector_db(row_count=10, indices=[])
+
+        agent_module._ensure_vector_index(vector_db)
+
+        vector_db.table.create_index.assert_not_called()
+
+    def test_large_table_indexed(self, monkeypatch):
+        """Test an IVF_PQ index is created once the table reaches MIN_ROWS_FOR_INDEX."""
+        from src.agents import agent as agent_module
+
+        monkeypatch.setattr(config, "MIN_ROWS_FOR_INDEX", 1000)
+        vector_db = self._vector_db(row_count=2500, indices=[])
+
+        agent_module._ensure_vector_index(vector_db)
+
+        vector_db.table.create_index.assert_called_once()
+        assert vector_db.table.create_index.call_args.kwargs["num_partitions"] == 50
+
+    def test_existing_index_optimized(self):
+        """Test an existing index is optimized so newly added rows are indexed."""
+        from src.agents import agent as agent_module
+
+        vector_db = self._vector_db(row_count=2500, indices=["vector_idx"])
+
+        agent_module._ensure_vector_index(vector_db)
+
+        vector_db.table.optimize.assert_called_once()
+        vector_db.table.create_index.assert_not_called()
+
+    def test_index_maintenance_runs_off_startup_path(self):
+        """Test index maintenance runs on a background thread, not in the caller."""
+        import threading
+
+        from src.agents import agent as agent_module
+
+        done = threading.Event()
+        threads = []
+
+        def _record(vector_db):
+            threads.append(threading.current_thread().name)
+            done.set()
+
+        with patch.object(agent_module, "_ensure_vector_index", side_effect=_record):
+            agent_module._start_vector_index_maintenance(Mock())
+            assert done.wait(timeout=5)
+
+        assert threads == ["lancedb-index"]
+
 
 class TestImageDetectionMode:
     """Tests for IMAGE_DETECTION_MODE configuration."""
@@ -196,6 +368,15 @@ class TestSystemInstructionsContent:
         assert "no ingredients" in instructions.lower() or "no ingredients detected" in instructions.lower()
         assert "unusual ingredient combination" in instructions.lower() or "edge case" in instructions.lower()
 
+    def test_system_instructions_memoized(self):
+        """Test system instructions are rendered once per parameter set."""
+        from src.prompts.prompts import get_system_instructions
+
+        first = get_system_instructions(max_recipes=7, max_tool_calls=4, use_spoonacular=True)
+        second = get_system_instructions(max_recipes=7, max_tool_calls=4, use_spoonacular=True)
+        assert first is second
+        assert get_system_instructions(max_recipes=7, max_tool_calls=4, use_spoonacular=False) != first
+
     def test_system_instructions_cover_critical_guardrails(self):
         """Test system instructions include critical guardrails."""
         instructions = self._get_system_instructions()
@@ -0,0 +1,41 @@
+"""Unit tests for running coroutines from synchronous code."""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.utils.async_compat import run_sync
+
+
+async def _current_thread_name() -> str:
+    """Return the name of the thread the coroutine runs on."""
+    return threading.current_thread().name
+
+
+async def _fail() -> None:
+    """Raise a fail-fast SystemExit like MCP initialization does."""
+    raise SystemExit(1)
+
+
+class TestRunSync:
+    """Tests for run_sync."""
+
+    def test_runs_in_caller_thread_without_running_loop(self):
+        """Test the coroutine runs via asyncio.run when no loop is active."""
+        assert run_sync(_current_thread_name()) == threading.current_thread().name
+
+    @pytest.mark.asyncio
+    async def test_runs_on_helper_thread_inside_running_loop(self):
+        """Test a running loop does not make run_sync fail."""
+        assert run_sync(_current_thread_name()) == "run-sync"
+
+    @pytest.mark.asyncio
+    async def test_exceptions_propagate_from_helper_thread(self):
+        """Test SystemExit raised on the helper thread reaches the caller."""
+        with pytest.raises(SystemExit):
+            run_sync(_fail())
+
+    def test_returns_value(self):
+        """Test the coroutine's return value is passed through."""
+        assert run_sync(asyncio.sleep(0, result=42)) == 42
@@ -47,6 +47,7 @@ class TestConfigInitialization:
         assert config.PORT == 8888
         assert config.MAX_HISTORY == 5
         assert config.MAX_IMAGE_SIZE_MB == 10
+        assert config.MAX_IMAGE_SIZE_BYTES == 10 * 1024 * 1024
         assert config.MIN_INGREDIENT_CONFIDENCE == 0.85
         assert config.GEMINI_MODEL == "custom-model"
         assert config.IMAGE_DETECTION_MODEL == "vision-model"
@@ -340,3 +341,201 @@ class TestCompressImg:
         monkeypatch.setenv("COMPRESS_IMG", "False")
         config2 = Config()
         assert config2.COMPRESS_IMG is False
+
+
+class TestDatabasePool:
+    """Test PostgreSQL connection pool configuration."""
+
+    def test_default_pool_settings(self, monkeypatch):
+        """Test pool settings fall back to defaults."""
+        monkeypatch.delenv("DB_POOL_SIZE", raising=False)
+        monkeypatch.delenv("DB_MAX_OVERFLOW", raising=False)
+        monkeypatch.delenv("DB_POOL_RECYCLE", raising=False)
+        monkeypatch.delenv("DB_CONNECT_TIMEOUT", raising=False)
+        monkeypatch.delenv("DB_POOL_WARMUP", raising=False)
+
+        config = Config()
+        assert config.DB_POOL_SIZE == 10
+        assert config.DB_MAX_OVERFLOW == 10
+        assert config.DB_POOL_RECYCLE == 300
+        assert config.DB_CONNECT_TIMEOUT == 5
+        assert config.DB_POOL_WARMUP == 2
+
+    def test_pool_settings_from_environment(self, monkeypatch):
+        """Test pool settings are loaded from environment variables."""
+        monkeypatch.setenv("DB_POOL_SIZE", "4")
+        monkeypatch.setenv("DB_MAX_OVERFLOW", "16")
+        monkeypatch.setenv("DB_POOL_RECYCLE", "1800")
+
+        config = Config()
+        assert config.DB_POOL_SIZE == 4
+        assert config.DB_MAX_OVERFLOW == 16
+        assert config.DB_POOL_RECYCLE == 1800
+
+    def test_invalid_pool_size_raises(self, monkeypatch):
+        """Test DB_POOL_SIZE below 1 is rejected."""
+        monkeypatch.setenv("GEMINI_API_KEY", "key")
+        monkeypatch.setenv("SPOONACULAR_API_KEY", "key")
+        monkeypatch.setenv("DB_POOL_SIZE", "0")
+
+        config = Config()
+        with pytest.raises(ValueError, match="DB_POOL_SIZE"):
+            config.validate()
+
+    def test_negative_max_overflow_raises(self, monkeypatch):
+        """Test negative DB_MAX_OVERFLOW is rejected."""
+        monkeypatch.setenv("GEMINI_API_KEY", "key")
+        monkeypatch.setenv("SPOONACULAR_API_KEY", "key")
+        monkeypatch.setenv("DB_MAX_OVERFLOW", "-1")
+
+        config = Config()
+        with pytest.raises(ValueError, match="DB_MAX_OVERFLOW"):
+            config.validate()
+
+    def test_invalid_connect_timeout_raises(self, monkeypatch):
+        """Test DB_CONNECT_TIMEOUT below 1 is rejected."""
+        monkeypatch.setenv("GEMINI_API_KEY", "key")
+        monkeypatch.setenv("SPOONACULAR_API_KEY", "key")
+        monkeypatch.setenv("DB_CONNECT_TIMEOUT", "0")
+
+        config = Config()
+        with pytest.raises(ValueError, match="DB_CONNECT_TIMEOUT"):
+            config.validate()
+
+
+class TestSqlitePragmas:
+    """Test SQLite session database pragma configuration."""
+
+    def test_default_sqlite_pragmas(self, monkeypatch):
+        """Test SQLITE_PRAGMAS defaults enable WAL and a busy timeout."""
+        monkeypatch.delenv("SQLITE_PRAGMAS", raising=False)
+
+        config = Config()
+        assert "journal_mode=WAL" in config.SQLITE_PRAGMAS
+        assert "busy_timeout=5000" in config.SQLITE_PRAGMAS
+
+    def test_sqlite_pragmas_from_environment(self, monkeypatch):
+        """Test SQLITE_PRAGMAS is split on semicolons, ignoring blanks."""
+        monkeypatch.setenv("SQLITE_PRAGMAS", "journal_mode=WAL; cache_size=-32000;")
+
+        config = Config()
+        assert config.SQLITE_PRAGMAS == ["journal_mode=WAL", "cache_size=-32000"]
+
+    def test_invalid_sqlite_pragma_raises(self, monkeypatch):
+        """Test a pragma that is not a plain name=value pair is rejected."""
+        monkeypatch.setenv("GEMINI_API_KEY", "key")
+        monkeypatch.setenv("SPOONACULAR_API_KEY", "key")
+        monkeypatch.setenv("SQLITE_PRAGMAS", "journal_mode=WAL, DROP TABLE x")
+
+        config = Config()
+        with pytest.raises(ValueError, match="SQLITE_PRAGMAS"):
+            config.validate()
+
+
+class TestStartupTimeout:
+    """Test agent startup timeout configuration."""
+
+    def test_default_startup_timeout(self, monkeypatch):
+        """Test STARTUP_TIMEOUT falls back to its default."""
+        monkeypatch.delenv("STARTUP_TIMEOUT", raising=False)
+
+        config = Config()
+        assert config.STARTUP_TIMEOUT == 120.0
+
+    def test_non_positive_startup_timeout_raises(self, monkeypatch):
+        """Test STARTUP_TIMEOUT of zero is rejected."""
+        monkeypatch.setenv("GEMINI_API_KEY", "key")
+        monkeypatch.setenv("SPOONACULAR_API_KEY", "key")
+        monkeypatch.setenv("STARTUP_TIMEOUT", "0")
+
+        config = Config()
+        with pytest.raises(ValueError, match="STARTUP_TIMEOUT"):
+            config.validate()
+
+
+class TestEmbeddingCache:
+    """Test knowledge base embedding cache configuration."""
+
+    def test_embedding_cache_enabled_by_default(self, monkeypatch):
+        """Test EMBEDDING_CACHE defaults to enabled."""
+        monkeypatch.delenv("EMBEDDING_CACHE", raising=False)
+
+        config = Config()
+        assert config.EMBEDDING_CACHE is True
+
+    def test_embedding_cache_disabled_from_environment(self, monkeypatch):
+        """Test EMBEDDING_CACHE can be turned off."""
+        monkeypatch.setenv("EMBEDDING_CACHE", "false")
+
+        config = Config()
+        assert config.EMBEDDING_CACHE is False
+
+
+class TestEmbeddingWarmup:
+    """Test embedding model warmup configuration."""
+
+    def test_embedding_warmup_disabled_by_default(self, monkeypatch):
+        """Test EMBEDDING_WARMUP defaults to loading the model on first use."""
+        monkeypatch.delenv("EMBEDDING_WARMUP", raising=False)
+
+        config = Config()
+        assert config.EMBEDDING_WARMUP is False
+
+    def test_embedding_warmup_enabled_from_environment(self, monkeypatch):
+        """Test EMBEDDING_WARMUP can be turned on."""
+        monkeypatch.setenv("EMBEDDING_WARMUP", "true")
+
+        config = Config()
+        assert config.EMBEDDING_WARMUP is True
+
+
+class TestEmbedderBackend:
+    """Test embedding inference backend configuration."""
+
+    def test_default_embedder_backend(self, monkeypatch):
+        """Test EMBEDDER_BACKEND defaults to PyTorch."""
+        monkeypatch.delenv("EMBEDDER_BACKEND", raising=False)
+
+        config = Config()
+        assert config.EMBEDDER_BACKEND == "torch"
+
+    def test_invalid_embedder_backend_raises(self, monkeypatch):
+        """Test an unknown EMBEDDER_BACKEND is rejected."""
+        monkeypatch.setenv("GEMINI_API_KEY", "key")
+        monkeypatch.setenv("SPOONACULAR_API_KEY", "key")
+        monkeypatch.setenv("EMBEDDER_BACKEND", "tensorrt")
+
+        config = Config()
+        with pytest.raises(ValueError, match="EMBEDDER_BACKEND"):
+            config.validate()
+
+    def test_invalid_embedder_dtype_raises(self, monkeypatch):
+        """Test an unsupported EMBEDDER_DTYPE is rejected."""
+        monkeypatch.setenv("GEMINI_API_KEY", "key")
+        monkeypatch.setenv("SPOONACULAR_API_KEY", "key")
+        monkeypatch.setenv("EMBEDDER_DTYPE", "int4")
+
+        config = Config()
+        with pytest.raises(ValueError, match="EMBEDDER_DTYPE"):
+            config.validate()
+
+
+class TestKnowledgeIndex:
+    """Test knowledge base vector index configuration."""
+
+    def test_default_min_rows_for_index(self, monkeypatch):
+        """Test MIN_ROWS_FOR_INDEX falls back to its default."""
+        monkeypatch.delenv("MIN_ROWS_FOR_INDEX", raising=False)
+
+        config = Config()
+        assert config.MIN_ROWS_FOR_INDEX == 1000
+
+    def test_invalid_min_rows_for_index_raises(self, monkeypatch):
+        """Test MIN_ROWS_FOR_INDEX below 1 is rejected."""
+        monkeypatch.setenv("GEMINI_API_KEY", "key")
+        monkeypatch.setenv("SPOONACULAR_API_KEY", "key")
+        monkeypatch.setenv("MIN_ROWS_FOR_INDEX", "0")
+
+        config = Config()
+        with pytest.raises(ValueError, match="MIN_ROWS_FOR_INDEX"):
+            config.validate()
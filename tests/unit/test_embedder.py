@@ -0,0 +1,198 @@
+"""Unit tests for the lazily loaded knowledge base embedder."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.utils.embedder import LazySentenceTransformerEmbedder
+
+
+def _encodes(mock_model_class, vector: list[float]) -> None:
+    """Make the patched model return vector for every single-text encode."""
+    mock_model_class.return_value.encode.return_value.tolist.return_value = [vector]
+
+
+class TestLazySentenceTransformerEmbedder:
+    """Tests for LazySentenceTransformerEmbedder."""
+
+    @patch("sentence_transformers.SentenceTransformer")
+    def test_construction_does_not_load_model(self, mock_model_class):
+        """Test creating the embedder leaves the model unloaded."""
+        embedder = LazySentenceTransformerEmbedder()
+
+        assert embedder.sentence_transformer_client is None
+        mock_model_class.assert_not_called()
+
+    @patch("sentence_transformers.SentenceTransformer")
+    def test_model_loaded_once_on_first_use(self, mock_model_class):
+        """Test the model is created on first ensure and reused afterwards."""
+        embedder = LazySentenceTransformerEmbedder()
+
+        embedder._ensure_model()
+        embedder._ensure_model()
+
+        mock_model_class.assert_called_once_with(model_name_or_path=embedder.id, cache_folder=None)
+        assert embedder.sentence_transformer_client is mock_model_class.return_value
+
+    @patch("sentence_transformers.SentenceTransformer")
+    def test_model_loaded_from_cache_dir(self, mock_model_class):
+        """Test a configured weights directory is passed to SentenceTransformer."""
+        embedder = LazySentenceTransformerEmbedder(model_cache_dir="/dev/shm/st_cache")
+
+        embedder._ensure_model()
+
+        mock_model_class.assert_called_once_with(model_name_or_path=embedder.id, cache_folder="/dev/shm/st_cache")
+
+    @patch("sentence_transformers.SentenceTransformer")
+    def test_onnx_backend_loads_quantized_file(self, mock_model_class):
+        """Test the ONNX backend and export file are passed to SentenceTransformer."""
+        embedder = LazySentenceTransformerEmbedder(backend="onnx", onnx_file_name="onnx/model_qint8.onnx")
+
+        embedder._ensure_model()
+
+        mock_model_class.assert_called_once_with(
+            model_name_or_path=embedder.id,
+            cache_folder=None,
+            backend="onnx",
+            model_kwargs={"file_name": "onnx/model_qint8.onnx"},
+        )
+
+    @patch("sentence_transformers.SentenceTransformer")
+    def test_torch_dtype_passed_as_model_kwargs(self, mock_model_class):
+        """Test a torch weight dtype is forwarded to SentenceTransformer."""
+        embedder = LazySentenceTransformerEmbedder(torch_dtype="bfloat16")
+
+        embedder._ensure_model()
+
+        mock_model_class.assert_called_once_with(
+            model_name_or_path=embedder.id, cache_folder=None, model_kwargs={"torch_dtype": "bfloat16"}
+        )
+
+    @patch("sentence_transformers.SentenceTransformer")
+    def test_warmup_loads_model_and_encodes(self, mock_model_class, tmp_path):
+        """Test warmup loads the model and runs one encode without touching the cache."""
+        embedder = LazySentenceTransformerEmbedder(cache_path=str(tmp_path / "cache.db"))
+
+        embedder.warmup()
+
+        mock_model_class.assert_called_once()
+        mock_model_class.return_value.encode.assert_called_once()
+        assert embedder._cache_conn is None
+
+    @pytest.mark.asyncio
+    @patch("sentence_transformers.SentenceTransformer")
+    async def test_async_embedding_loads_model(self, mock_model_class):
+        """Test the async embedding path loads the model before encoding."""
+        _encodes(mock_model_class, [0.5, 0.25])
+        embedder = LazySentenceTransformerEmbedder()
+
+        result = await embedder.async_get_embedding("tomato")
+
+        mock_model_class.assert_called_once()
+        assert result == [0.5, 0.25]
+
+
+class TestEmbeddingCache:
+    """Tests for the persistent embedding cache."""
+
+    @patch("sentence_transformers.SentenceTransformer")
+    def test_cache_hit_skips_model(self, mock_model_class, tmp_path):
+        """Test a cached embedding survives a new embedder instance without recomputation."""
+        _encodes(mock_model_class, [0.5, 0.25])
+        cache_path = str(tmp_path / "cache.db")
+
+        first = LazySentenceTransformerEmbedder(cache_path=cache_path).get_embedding("basil")
+        second_embedder = LazySentenceTransformerEmbedder(cache_path=cache_path)
+        second = second_embedder.get_embedding("basil")
+
+        assert first == second == [0.5, 0.25]
+        mock_model_class.return_value.encode.assert_called_once()
+        assert second_embedder.sentence_transformer_client is None
+
+    @patch("sentence_transformers.SentenceTransformer")
+    def test_cache_keyed_by_model(self, mock_model_class, tmp_path):
+        """Test the same text under a different model id is embedded again."""
+        _encodes(mock_model_class, [0.5, 0.25])
+        cache_path = str(tmp_path / "cache.db")
+
+        LazySentenceTransformerEmbedder(cache_path=cache_path).get_embedding("basil")
+        LazySentenceTransformerEmbedder(id="other-model", cache_path=cache_path).get_embedding("basil")
+
+        assert mock_model_class.return_value.encode.call_count == 2
+
+    @patch("sentence_transformers.SentenceTransformer")
+    def test_repeat_query_served_from_memory(self, mock_model_class, tmp_path):
+        """Test a repeated text skips the model and the SQLite cache."""
+        _encodes(mock_model_class, [0.5, 0.25])
+        embedder = LazySentenceTransformerEmbedder(cache_path=str(tmp_path / "cache.db"))
+        embedder.get_embedding("basil")
+
+        with patch.object(embedder, "_cache_get_many") as mock_cache_get:
+            assert embedder.get_embedding("basil") == [0.5, 0.25]
+
+        mock_cache_get.assert_not_called()
+        mock_model_class.return_value.encode.assert_called_once()
+
+    @patch("sentence_transformers.SentenceTransformer")
+    def test_memory_cache_evicts_least_recent(self, mock_model_class):
+        """Test the in-memory cache stays within memory_cache_size."""
+        _encodes(mock_model_class, [0.5, 0.25])
+        embedder = LazySentenceTransformerEmbedder(memory_cache_size=2)
+
+        for text in ("basil", "thyme", "basil", "sage"):
+            embedder.get_embedding(text)
+
+        assert list(embedder._memory_cache) == ["basil", "sage"]
+
+    @patch("sentence_transformers.SentenceTransformer")
+    def test_no_cache_path_always_embeds(self, mock_model_class):
+        """Test caching is disabled without a cache path and with the memory cache off."""
+        _encodes(mock_model_class, [0.5, 0.25])
+        embedder = LazySentenceTransformerEmbedder(memory_cache_size=0)
+
+        embedder.get_embedding("basil")
+        embedder.get_embedding("basil")
+
+        assert mock_model_class.return_value.encode.call_count == 2
+
+
+class TestBatchEmbeddings:
+    """Tests for batched embedding."""
+
+    @patch("sentence_transformers.SentenceTransformer")
+    def test_misses_encoded_in_one_call(self, mock_model_class, tmp_path):
+        """Test only uncached texts are encoded, together, and results keep input order."""
+        mock_model_class.return_value.encode.return_value.tolist.return_value = [[1.0], [3.0]]
+        embedder = LazySentenceTransformerEmbedder(cache_path=str(tmp_path / "cache.db"))
+        embedder._cache_put_many([(embedder._cache_key("basil"), [2.0])])
+
+        result = embedder.get_embeddings_batch(["tomato", "basil", "garlic"])
+
+        assert result == [[1.0], [2.0], [3.0]]
+        mock_model_class.return_value.encode.assert_called_once()
+        assert mock_model_class.return_value.encode.call_args.args[0] == ["tomato", "garlic"]
+
+    @patch("sentence_transformers.SentenceTransformer")
+    def test_all_cached_skips_model(self, mock_model_class, tmp_path):
+        """Test a fully cached batch never loads the model."""
+        embedder = LazySentenceTransformerEmbedder(cache_path=str(tmp_path / "cache.db"))
+        embedder._cache_put_many([(embedder._cache_key("basil"), [2.0])])
+
+        assert embedder.get_embeddings_batch(["basil"]) == [[2.0]]
+        mock_model_class.assert_not_called()
+
+    @patch("sentence_transformers.SentenceTransformer")
+    def test_batch_matches_single_text(self, mock_model_class):
+        """Test batch and single-text embedding encode with the same options and agree."""
+
+        def _encode(texts, prompt=None, normalize_embeddings=False, **kwargs):
+            vectors = [[float(len(text)), float(bool(prompt)), float(normalize_embeddings)] for text in texts]
+            return Mock(tolist=Mock(return_value=vectors))
+
+        mock_model_class.return_value.encode.side_effect = _encode
+        embedder = LazySentenceTransformerEmbedder(prompt="query: ", normalize_embeddings=True, memory_cache_size=0)
+
+        batch = embedder.get_embeddings_batch(["basil", "thyme", "oregano"])
+
+        assert batch == [embedder.get_embedding(text) for text in ["basil", "thyme", "oregano"]]
+        assert batch[0] == [5.0, 1.0, 1.0]
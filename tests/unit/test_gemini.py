@@ -0,0 +1,64 @@
+"""Unit tests for the shared GenAI client."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.utils.gemini import get_genai_client, warm_up_genai_client
+
+
+class TestGetGenaiClient:
+    """Tests for get_genai_client singleton."""
+
+    def setup_method(self):
+        """Reset the cached client between tests."""
+        get_genai_client.cache_clear()
+
+    def teardown_method(self):
+        """Drop mocked clients so other tests build a fresh one."""
+        get_genai_client.cache_clear()
+
+    @patch("src.utils.gemini.genai.Client")
+    def test_client_created_once(self, mock_client_class):
+        """Test repeated calls return the same client instance."""
+        first = get_genai_client()
+        second = get_genai_client()
+
+        assert first is second
+        mock_client_class.assert_called_once()
+
+    @patch("src.utils.gemini.config")
+    @patch("src.utils.gemini.genai.Client")
+    def test_client_uses_gemini_api_key(self, mock_client_class, mock_config):
+        """Test client is authenticated with the configured API key."""
+        mock_config.GEMINI_API_KEY = "test-key"
+
+        get_genai_client()
+
+        mock_client_class.assert_called_once_with(api_key="test-key")
+
+
+class TestWarmUpGenaiClient:
+    """Tests for warm_up_genai_client."""
+
+    @pytest.mark.asyncio
+    @patch("src.utils.gemini.get_genai_client")
+    async def test_warm_up_fetches_model_metadata(self, mock_get_client):
+        """Test warm-up issues a metadata request on the shared client."""
+        mock_client = Mock()
+        mock_client.aio.models.get = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        await warm_up_genai_client()
+
+        mock_client.aio.models.get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("src.utils.gemini.get_genai_client")
+    async def test_warm_up_failure_is_ignored(self, mock_get_client):
+        """Test warm-up errors never propagate to startup."""
+        mock_client = Mock()
+        mock_client.aio.models.get = AsyncMock(side_effect=Exception("network down"))
+        mock_get_client.return_value = mock_client
+
+        await warm_up_genai_client()
@@ -8,16 +8,23 @@ Tests cover:
 - Error handling and resilience
 """
 
-from unittest.mock import AsyncMock, Mock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
+import pytest_asyncio
 
 from src.mcp_tools.ingredients import (
+    _get_http_session,
+    close_http_session,
+    compress_image,
     detect_ingredients_tool,
     extract_ingredients_from_image,
     extract_ingredients_pre_hook,
     extract_ingredients_with_retries,
+    fetch_image_bytes,
     filter_ingredients_by_confidence,
+    get_image_mime_type,
     parse_gemini_response,
     validate_image_format,
     validate_image_size,
@@ -25,6 +32,13 @@ from src.mcp_tools.ingredients import (
 from src.models.models import IngredientDetectionOutput
 
 
+@pytest_asyncio.fixture(autouse=True)
+async def close_shared_http_session():
+    """Close the shared image download session after each test (each test gets its own event loop)."""
+    yield
+    await close_http_session()
+
+
 class TestValidateImageFormat:
     """Test image format validation."""
 
@@ -49,6 +63,12 @@ class TestValidateImageFormat:
         """Empty bytes should be rejected."""
         assert validate_image_format(b"") is False
 
+    def test_mime_type_detection(self):
+        """MIME type should be detected from magic bytes in a single call."""
+        assert get_image_mime_type(b"\xff\xd8\xff\xe0\x00\x10JFIF") == "image/jpeg"
+        assert get_image_mime_type(b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR") == "image/png"
+        assert get_image_mime_type(b"GIF89a") is None
+
 
 class TestValidateImageSize:
     """Test image size validation."""
@@ -332,19 +352,106 @@ class TestExtractIngredientsPreHook:
         assert run_input.images == []
 
 
+class TestHttpSession:
+    """Test the shared image download session."""
+
+    @pytest.mark.asyncio
+    async def test_session_reused_until_closed(self):
+        """The same session should be returned on one event loop until closed."""
+        first = _get_http_session()
+        second = _get_http_session()
+        assert first is second
+
+        await close_http_session()
+        assert first.closed
+
+        third = _get_http_session()
+        assert third is not first
+        await close_http_session()
+
+    def test_session_per_event_loop(self):
+        """A session on one loop should stay open while another loop gets its own."""
+
+        async def _get_open_session():
+            return _get_http_session()
+
+        first_loop = asyncio.new_event_loop()
+        second_loop = asyncio.new_event_loop()
+        try:
+            first = first_loop.run_until_complete(_get_open_session())
+            second = second_loop.run_until_complete(_get_open_session())
+
+            assert second is not first
+            assert not first.closed
+            assert first_loop.run_until_complete(_get_open_session()) is first
+
+            first_loop.run_until_complete(close_http_session())
+            second_loop.run_until_complete(close_http_session())
+            assert first.closed and second.closed
+        finally:
+            first_loop.close()
+            second_loop.close()
+
+
+class TestFetchImageBytes:
+    """Test URL image download with size guard."""
+
+    @staticmethod
+    def _mock_session(content_length, chunks):
+        response = MagicMock()
+        response.content_length = content_length
+
+        async def _iter_chunked(_size):
+            for chunk in chunks:
+                yield chunk
+
+        response.content.iter_chunked = _iter_chunked
+        session = MagicMock()
+        session.get.return_value.__aenter__ = AsyncMock(return_value=response)
+        session.get.return_value.__aexit__ = AsyncMock(return_value=False)
+        return session
+
+    @pytest.mark.asyncio
+    @patch("src.mcp_tools.ingredients._get_http_session")
+    async def test_streams_body_within_limit(self, mock_get_session):
+        """Image within the size limit should be returned in full."""
+        mock_get_session.return_value = self._mock_session(None, [b"abc", b"def"])
+
+        assert await fetch_image_bytes("http://example.com/image.jpg") == b"abcdef"
+
+    @pytest.mark.asyncio
+    @patch("src.mcp_tools.ingredients._get_http_session")
+    async def test_rejects_oversize_content_length(self, mock_get_session):
+        """Declared Content-Length above the limit should be rejected before reading the body."""
+        mock_get_session.return_value = self._mock_session(100 * 1024 * 1024, [b"never read"])
+
+        with patch("src.mcp_tools.ingredients.config.MAX_IMAGE_SIZE_BYTES", 1024 * 1024):
+            assert await fetch_image_bytes("http://example.com/image.jpg") is None
+
+    @pytest.mark.asyncio
+    @patch("src.mcp_tools.ingredients._get_http_session")
+    async def test_aborts_oversize_stream(self, mock_get_session):
+        """Body without Content-Length should be aborted once it exceeds the limit."""
+        chunk = b"x" * (512 * 1024)
+        mock_get_session.return_value = self._mock_session(None, [chunk, chunk, chunk])
+
+        with patch("src.mcp_tools.ingredients.config.MAX_IMAGE_SIZE_BYTES", 1024 * 1024):
+            assert await fetch_image_bytes("http://example.com/image.jpg") is None
+
+
 class TestExtractIngredientsFromImage:
     """Test the Gemini vision API integration."""
 
     @pytest.mark.asyncio
-    @patch("src.mcp_tools.ingredients.genai.Client")
-    async def test_successful_call(self, mock_client_class):
+    @patch("src.mcp_tools.ingredients.get_genai_client")
+    async def test_successful_call(self, mock_get_client):
         """Successful API call should return validated IngredientDetectionOutput."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         mock_response = Mock()
         mock_response.text = '{"ingredients": ["tomato"], "confidence_scores": {"tomato": 0.95}}'
-        mock_client.models.generate_content.return_value = mock_response
+        mock_client.aio.models.generate_content = AsyncMock(return_value=mock_response)
 
         # PNG magic bytes
         image_bytes = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
@@ -356,16 +463,20 @@ class TestExtractIngredientsFromImage:
         assert result.ingredients == ["tomato"]
         assert result.confidence_scores["tomato"] == 0.95
 
+        # JSON mode requested so the response is a bare JSON object
+        call_kwargs = mock_client.aio.models.generate_content.call_args.kwargs
+        assert call_kwargs["config"].response_mime_type == "application/json"
+
     @pytest.mark.asyncio
-    @patch("src.mcp_tools.ingredients.genai.Client")
-    async def test_invalid_response_structure(self, mock_client_class):
+    @patch("src.mcp_tools.ingredients.get_genai_client")
+    async def test_invalid_response_structure(self, mock_get_client):
         """Invalid response structure should return None."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         mock_response = Mock()
         mock_response.text = '{"invalid": "structure"}'  # Missing required fields
-        mock_client.models.generate_content.return_value = mock_response
+        mock_client.aio.models.generate_content = AsyncMock(return_value=mock_response)
 
         # PNG magic bytes
         image_bytes = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
@@ -375,12 +486,28 @@ class TestExtractIngredientsFromImage:
         assert result is None
 
     @pytest.mark.asyncio
-    @patch("src.mcp_tools.ingredients.genai.Client")
-    async def test_api_error(self, mock_client_class):
+    @patch("src.mcp_tools.ingredients.get_image_mime_type")
+    @patch("src.mcp_tools.ingredients.get_genai_client")
+    async def test_known_mime_type_skips_detection(self, mock_get_client, mock_guess):
+        """A MIME type passed by the caller should be used without re-scanning the bytes."""
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+        mock_response = Mock()
+        mock_response.text = '{"ingredients": ["tomato"], "confidence_scores": {"tomato": 0.95}}'
+        mock_client.aio.models.generate_content = AsyncMock(return_value=mock_response)
+
+        result = await extract_ingredients_from_image(b"\x89PNG\r\n\x1a\n", mime_type="image/png")
+
+        assert result is not None
+        mock_guess.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("src.mcp_tools.ingredients.get_genai_client")
+    async def test_api_error(self, mock_get_client):
         """API errors should be caught and return None."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
-        mock_client.models.generate_content.side_effect = Exception("API error")
+        mock_get_client.return_value = mock_client
+        mock_client.aio.models.generate_content = AsyncMock(side_effect=Exception("API error"))
 
         # PNG magic bytes
         image_bytes = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
@@ -551,6 +678,25 @@ class TestDetectIngredientsTool:
         assert isinstance(result, IngredientDetectionOutput)
         assert result.ingredients == ["tomato"]
 
+    @pytest.mark.asyncio
+    @patch("src.mcp_tools.ingredients.asyncio.to_thread", new_callable=AsyncMock)
+    @patch("src.mcp_tools.ingredients.extract_ingredients_with_retries", new_callable=AsyncMock)
+    @patch("src.mcp_tools.ingredients.fetch_image_bytes", new_callable=AsyncMock)
+    async def test_compression_offloaded_to_thread(self, mock_fetch, mock_extract, mock_to_thread):
+        """Image compression should run in a worker thread, not on the event loop."""
+        png_bytes = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
+        mock_fetch.return_value = png_bytes
+        mock_to_thread.return_value = png_bytes
+        mock_extract.return_value = IngredientDetectionOutput(
+            ingredients=["tomato"],
+            confidence_scores={"tomato": 0.95},
+        )
+
+        with patch("src.mcp_tools.ingredients.config.COMPRESS_IMG", True):
+            await detect_ingredients_tool("http://example.com/image.png")
+
+        mock_to_thread.assert_awaited_once_with(compress_image, png_bytes)
+
     @pytest.mark.asyncio
     @patch("src.mcp_tools.ingredients.fetch_image_bytes")
     async def test_invalid_image_format(self, mock_fetch):
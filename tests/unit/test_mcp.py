@@ -50,3 +50,23 @@ class TestMCPInitialize:
 
         assert result == mock_instance
         assert mock_to_thread.call_count == 3
+
+    @pytest.mark.asyncio
+    @patch("src.mcp_tools.spoonacular.asyncio.sleep", new_callable=AsyncMock)
+    @patch("src.mcp_tools.spoonacular.asyncio.to_thread", new_callable=AsyncMock)
+    async def test_retry_delays_are_jittered(self, mock_to_thread: Mock, mock_sleep: Mock) -> None:
+        """Test retry delays are randomized around the configured base delays."""
+        mock_to_thread.side_effect = [ConnectionError(), ConnectionError(), MagicMock()]
+
+        mcp = SpoonacularMCP(api_key="test", max_retries=3, retry_delays=[1, 2, 4])
+        await mcp.initialize()
+
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        assert 0.5 <= delays[0] <= 1.5
+        assert 1.0 <= delays[1] <= 3.0
+
+    def test_retry_delay_without_jitter(self) -> None:
+        """Test base delays are used unchanged when jitter is disabled."""
+        mcp = SpoonacularMCP(api_key="test", retry_delays=[1, 2, 4], jitter=False)
+
+        assert [mcp._retry_delay(i) for i in range(4)] == [1, 2, 4, 4]
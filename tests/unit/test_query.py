@@ -0,0 +1,238 @@
+"""Unit tests for the query.py command-line interface."""
+
+import asyncio
+import base64
+import json
+import sys
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+import query
+
+
+async def _failing_initialize_recipe_agent(use_db: bool):
+    """Fail agent startup the way MCP initialization does (fail-fast SystemExit)."""
+    raise SystemExit(1)
+
+
+class TestRunQuery:
+    """Tests for run_query on the persistent event loop."""
+
+    def test_startup_failure_exits_instead_of_hanging(self, monkeypatch):
+        """Test a fail-fast MCP error during startup exits with status 1 and leaves the loop running."""
+        result = {}
+
+        def _run():
+            try:
+                query.run_query("pasta")
+            except SystemExit as e:
+                result["code"] = e.code
+
+        fake_agent_module = SimpleNamespace(initialize_recipe_agent=_failing_initialize_recipe_agent)
+        monkeypatch.setitem(sys.modules, "src.agents.agent", fake_agent_module)
+        monkeypatch.setattr(query, "_genai_warmed", False)
+        with patch("src.utils.gemini.warm_up_genai_client", new=AsyncMock()):
+            thread = threading.Thread(target=_run, daemon=True)
+            thread.start()
+            thread.join(timeout=5)
+
+        assert not thread.is_alive(), "run_query hung after SystemExit on the loop thread"
+        assert result == {"code": 1}
+
+        # The shared loop keeps serving later calls
+        future = asyncio.run_coroutine_threadsafe(asyncio.sleep(0, result="alive"), query._get_event_loop())
+        assert future.result(timeout=5) == "alive"
+
+    def test_exit_handler_closes_clients_and_stops_loop(self, monkeypatch):
+        """Test the atexit handler closes loop-bound clients on the loop, then stops it."""
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        close_clients = AsyncMock()
+        monkeypatch.setattr(query, "_event_loop", loop)
+        monkeypatch.setattr(query, "_close_clients", close_clients)
+
+        query._shutdown_event_loop()
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        close_clients.assert_awaited_once()
+        loop.close()
+
+
+class TestImageDataUrl:
+    """Tests for _image_data_url."""
+
+    def test_matches_reference_encoding(self):
+        """Test chunked encoding matches one-shot base64 for every padding case."""
+        for size in (0, 1, 2, 3, 1000):
+            image_bytes = bytes(range(256)) * (size // 256) + bytes(range(size % 256))
+            expected = f"data:image/png;base64,{base64.b64encode(image_bytes).decode()}"
+
+            assert query._image_data_url(image_bytes, "image/png") == expected
+
+    def test_multi_chunk_payload(self):
+        """Test payloads spanning several chunks are encoded contiguously."""
+        image_bytes = bytes(range(256)) * (query._B64_CHUNK_SIZE // 256 * 2 + 3) + b"xy"
+
+        expected = f"data:image/jpeg;base64,{base64.b64encode(image_bytes).decode()}"
+        assert query._image_data_url(image_bytes, "image/jpeg") == expected
+
+
+class TestParseArgs:
+    """Tests for _parse_args."""
+
+    def test_flags_before_query(self):
+        """Test flags followed by a multi-word query."""
+        args = query._parse_args(["--debug", "--stateless", "--image", "pasta.png", "what", "can", "I", "make?"])
+
+        assert args.debug is True
+        assert args.stateless is True
+        assert args.image == "pasta.png"
+        assert args.query == ["what", "can", "I", "make?"]
+
+    def test_flags_after_query(self):
+        """Test flags given after the query text."""
+        args = query._parse_args(["chicken and rice", "--debug"])
+
+        assert args.debug is True
+        assert args.stateless is False
+        assert args.query == ["chicken and rice"]
+
+    def test_dash_words_after_separator(self):
+        """Test query words starting with "-" are kept as query text after "--"."""
+        args = query._parse_args(["--stateless", "--", "recipes", "-without", "nuts"])
+
+        assert args.stateless is True
+        assert args.debug is False
+        assert args.query == ["recipes", "-without", "nuts"]
+
+    def test_batch_alone(self):
+        """Test --batch without an inline query."""
+        args = query._parse_args(["--batch", "queries.txt", "--stateless"])
+
+        assert args.batch == "queries.txt"
+        assert args.query == []
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["--batch", "queries.txt", "--image", "pasta.png"],
+            ["--batch", "queries.txt", "chicken"],
+            ["--debug"],
+            ["recipes", "-without", "nuts"],
+            [],
+        ],
+    )
+    def test_invalid_combinations_exit(self, argv):
+        """Test --batch with --image or a query, a missing query, a "-" word without "--", and no arguments exit."""
+        with pytest.raises(SystemExit) as exc_info:
+            query._parse_args(argv)
+
+        assert exc_info.value.code != 0
+
+
+class TestRunBatch:
+    """Tests for run_batch file handling."""
+
+    def test_blank_lines_skipped(self, tmp_path):
+        """Test each non-blank line becomes one query, stripped, in file order."""
+        batch_file = tmp_path / "queries.txt"
+        batch_file.write_text("chicken and rice\n\n   \n  vegan pasta  \n", encoding="utf-8")
+        received = []
+
+        async def _record(queries, debug, stateless):
+            received.extend(queries)
+            return []
+
+        with patch.object(query, "_run_batch_async", new=_record):
+            query.run_batch(str(batch_file))
+
+        assert received == ["chicken and rice", "vegan pasta"]
+
+    def test_failed_query_does_not_stop_batch(self, tmp_path, capsys):
+        """Test a failing query is reported by index, later queries still run, and the exit is 1."""
+        batch_file = tmp_path / "queries.txt"
+        batch_file.write_text("chicken\n{bad\nrice\n", encoding="utf-8")
+        received = []
+
+        async def _run_query(query_text, debug, stateless):
+            received.append(query_text)
+            if query_text == "{bad":
+                raise ValueError("bad query")
+
+        with (
+            patch.object(query, "_get_agent", new=AsyncMock()),
+            patch.object(query, "_run_query_async", new=_run_query),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            query.run_batch(str(batch_file))
+
+        assert exc_info.value.code == 1
+        assert received == ["chicken", "{bad", "rice"]
+        assert "1/3 batch queries failed: 2" in capsys.readouterr().out
+
+    def test_empty_file_exits(self, tmp_path):
+        """Test a file with only blank lines reports the error and exits with status 1."""
+        batch_file = tmp_path / "queries.txt"
+        batch_file.write_text("\n  \n", encoding="utf-8")
+
+        with patch.object(query, "_get_console", return_value=Mock()) as mock_console:
+            with pytest.raises(SystemExit) as exc_info:
+                query.run_batch(str(batch_file))
+
+        assert exc_info.value.code == 1
+        mock_console.return_value.print.assert_called_once()
+        assert "No queries found" in mock_console.return_value.print.call_args.args[0]
+
+    def test_missing_file_exits(self, tmp_path):
+        """Test a nonexistent batch file exits with status 1."""
+        with pytest.raises(SystemExit) as exc_info:
+            query.run_batch(str(tmp_path / "missing.txt"))
+
+        assert exc_info.value.code == 1
+
+
+class TestAgentInput:
+    """Tests for how _run_query_async forwards the query to the agent."""
+
+    async def _sent_input(self, text: str, image_path: str = None) -> str:
+        """Run a query against a mocked agent and return the input passed to arun."""
+        agent = Mock()
+        agent.arun = AsyncMock(return_value=SimpleNamespace(content="ok"))
+
+        with (
+            patch.object(query, "_get_agent", new=AsyncMock(return_value=agent)),
+            patch("src.mcp_tools.ingredients.close_http_session", new=AsyncMock()),
+        ):
+            await query._run_query_async(text, debug=False, stateless=True, image_path=image_path)
+
+        return agent.arun.call_args.kwargs["input"]
+
+    @pytest.mark.asyncio
+    async def test_json_request_forwarded_unchanged(self):
+        """Test a JSON object with a message field is passed through without re-serializing."""
+        text = '{"message":  "pasta ideas", "images": []}'
+
+        assert await self._sent_input(text) is text
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("text", ["pasta ideas", "[1, 2]", '"just a string"', '{"prompt": "pasta"}'])
+    async def test_other_input_wrapped_as_message(self, text):
+        """Test plain text, non-object JSON and objects without a message are wrapped."""
+        assert json.loads(await self._sent_input(text)) == {"message": text}
+
+    @pytest.mark.asyncio
+    async def test_json_request_with_image_reserialized(self, tmp_path):
+        """Test adding an image re-serializes the request with the data URL appended."""
+        image_path = tmp_path / "pasta.png"
+        image_path.write_bytes(b"png-bytes")
+        text = '{"message": "what can I make?"}'
+
+        sent = json.loads(await self._sent_input(text, image_path=str(image_path)))
+
+        assert sent["message"] == "what can I make?"
+        assert sent["images"] == [f"data:image/png;base64,{base64.b64encode(b'png-bytes').decode()}"]